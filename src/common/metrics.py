@@ -0,0 +1,115 @@
+import atexit
+import glob
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by view",
+    ["view", "method", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL queries issued per HTTP request",
+    ["view"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+
+SYNC_PAGES_FETCHED = Counter(
+    "sync_pages_fetched_total",
+    "Provider pages fetched by sync_events",
+)
+SYNC_EVENTS = Counter(
+    "sync_events_total",
+    "Events processed by sync_events by outcome",
+    ["result"],
+)
+SYNC_HTTP_RETRIES = Counter(
+    "sync_http_retries_total",
+    "HTTP retries performed while fetching provider pages",
+)
+SYNC_PAGE_CACHE = Counter(
+    "sync_page_cache_total",
+    "Provider page cache lookups by sync_events by outcome",
+    ["result"],
+)
+SYNC_PHASE_DURATION = Histogram(
+    "sync_phase_duration_seconds",
+    "Duration of sync_events phases",
+    ["phase"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task execution time",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+CLEANUP_DELETED_EVENTS = Counter(
+    "events_cleanup_deleted_total",
+    "Events deleted by cleanup_old_events",
+)
+
+
+class MultiProcessTreeCollector(multiprocess.MultiProcessCollector):
+    """
+    Агрегирует файлы метрик каталога и его подкаталогов. У каждого сервиса
+    свой подкаталог: pid процессов разных контейнеров совпадают, а файлы
+    метрик называются по pid.
+    """
+
+    def collect(self):
+        pattern = os.path.join(self._path, "**", "*.db")
+        return self.merge(glob.glob(pattern, recursive=True), accumulate=True)
+
+
+def mark_process_dead(pid: int | None = None):
+    """
+    Удаляет файлы live-метрик (livesum) завершившегося процесса, чтобы
+    его значения не оставались в сумме навсегда.
+
+    :param pid: Идентификатор процесса; по умолчанию текущий.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# Обычное завершение процесса (в том числе перезапуск runserver); дочерние
+# процессы Celery выходят через os._exit и вызывают mark_process_dead сами.
+atexit.register(mark_process_dead)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    Собирает метрики текущего процесса или, если задан
+    PROMETHEUS_MULTIPROC_DIR, агрегирует метрики всех процессов из
+    PROMETHEUS_MULTIPROC_ROOT (по умолчанию — из PROMETHEUS_MULTIPROC_DIR).
+
+    :return: Тело ответа и Content-Type.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        registry = CollectorRegistry()
+        MultiProcessTreeCollector(
+            registry, os.environ.get("PROMETHEUS_MULTIPROC_ROOT", directory)
+        )
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
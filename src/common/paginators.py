@@ -0,0 +1,34 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц: для запроса без фильтров берет оценку числа
+    строк из статистики PostgreSQL (pg_class.reltuples) вместо COUNT(*).
+
+    Отфильтрованные запросы и небольшие таблицы считаются точно.
+    """
+
+    exact_count_threshold = 10000
+
+    def _estimate(self) -> int | None:
+        queryset = self.object_list
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1: таблица еще ни разу не анализировалась.
+        return row[0] if row and row[0] >= 0 else None
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if hasattr(queryset, "query") and not queryset.query.where:
+            estimate = self._estimate()
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return super().count
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+from common.timing import serialize_timing
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer, время построения data которого попадает в Server-Timing
+    как serialize, а не в view.
+    """
+
+    @property
+    def data(self):
+        with serialize_timing():
+            return super().data
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer с учетом времени сериализации в Server-Timing. Для
+    many=True наследникам нужен Meta.list_serializer_class = TimedListSerializer.
+    """
+
+    @property
+    def data(self):
+        with serialize_timing():
+            return super().data
@@ -0,0 +1,24 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Замеры текущего запроса; выставляет ServerTimingMiddleware (core.middleware)
+# на время профилируемого запроса.
+current_timings = ContextVar("server_timings", default=None)
+
+
+@contextmanager
+def serialize_timing():
+    """
+    Учитывает время блока как сериализацию ответа (serialize в Server-Timing)
+    текущего запроса; вне профилируемого запроса ничего не делает.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serialize_time += time.perf_counter() - started
@@ -1,8 +1,41 @@
 import os
+import time
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown
+from django.db import close_old_connections
+
+from common.metrics import CELERY_TASK_DURATION, mark_process_dead
+from core.db_router import pin_to_primary
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 app = Celery("core")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+_task_started = {}
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(pid=None, **kwargs):
+    mark_process_dead(pid)
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs):
+    # Как request_started/request_finished в Django: соединение возвращается
+    # в пул, а без пула закрывается по CONN_MAX_AGE или после сбоя.
+    close_old_connections()
+    pin_to_primary(False)
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    close_old_connections()
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+        time.perf_counter() - started
+    )
@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+_replica_health = {}
+_probe_locks = {}
+
+
+def pin_to_primary(pinned: bool = True):
+    """
+    Направляет последующие чтения текущего контекста в основную базу.
+
+    :param pinned: Включить или снять закрепление.
+    :return: Токен ContextVar для восстановления прежнего значения.
+    """
+    return _pinned_to_primary.set(pinned)
+
+
+def reset_pinning(token):
+    """
+    Восстанавливает закрепление, действовавшее до pin_to_primary.
+
+    :param token: Токен, полученный от pin_to_primary.
+    """
+    _pinned_to_primary.reset(token)
+
+
+def replica_lag(alias: str) -> float | None:
+    """
+    Возвращает отставание реплики в секундах или None, если реплика недоступна.
+
+    :param alias: Алиас базы данных реплики.
+    :return: Отставание в секундах или None.
+    """
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            return float(cursor.fetchone()[0])
+    except DatabaseError as e:
+        logger.warning(f"Replica {alias} is unavailable: {e}")
+        return None
+
+
+def is_replica_healthy(alias: str) -> bool:
+    """
+    Проверяет отставание реплики не чаще раза в CHECK_INTERVAL секунд.
+    Ожидание недоступной реплики ограничено DB_REPLICA_CONNECT_TIMEOUT.
+
+    :param alias: Алиас базы данных реплики.
+    :return: True, если реплика доступна и отстает не больше MAX_LAG.
+    """
+    config = settings.DATABASE_REPLICAS
+    checked_at, healthy = _replica_health.get(alias, (None, False))
+    if (
+        checked_at is not None
+        and time.monotonic() - checked_at < config["CHECK_INTERVAL"]
+    ):
+        return healthy
+    # Реплику проверяет один поток; остальные не ждут его, а используют
+    # прежний результат (до первой проверки — основную базу).
+    lock = _probe_locks.setdefault(alias, threading.Lock())
+    if not lock.acquire(blocking=False):
+        return healthy
+    try:
+        lag = replica_lag(alias)
+        healthy = lag is not None and lag <= config["MAX_LAG"]
+        if lag is not None and not healthy:
+            logger.warning(
+                f"Replica {alias} lags by {lag:.1f}s, using primary"
+            )
+        _replica_health[alias] = (time.monotonic(), healthy)
+    finally:
+        lock.release()
+    return healthy
+
+
+class ReplicaRouter:
+    """
+    Направляет чтения приложений из DATABASE_REPLICAS["APPS"] на реплики,
+    а записи и чтения после записи в том же запросе — в основную базу.
+    """
+
+    def _replicas(self) -> list[str]:
+        return settings.DATABASE_REPLICAS["ALIASES"]
+
+    def db_for_read(self, model, **hints):
+        config = settings.DATABASE_REPLICAS
+        if model._meta.app_label not in config["APPS"]:
+            return None
+        if _pinned_to_primary.get():
+            return DEFAULT_DB_ALIAS
+        healthy = [
+            alias for alias in self._replicas() if is_replica_healthy(alias)
+        ]
+        if not healthy:
+            return DEFAULT_DB_ALIAS
+        return random.choice(healthy)
+
+    def db_for_write(self, model, **hints):
+        _pinned_to_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *self._replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
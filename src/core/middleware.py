@@ -0,0 +1,345 @@
+import hmac
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from common.logger import get_logger
+from common.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from common.timing import current_timings
+from core.db_router import pin_to_primary, reset_pinning
+
+logger = get_logger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+METRIC_METHODS = frozenset(
+    ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+)
+
+
+class RequestTimings:
+    """
+    Замеры одного запроса: SQL, время view, сериализации и рендеринга ответа.
+    """
+
+    __slots__ = (
+        "sql_count",
+        "sql_time",
+        "serialize_time",
+        "view_started",
+        "view_finished",
+        "render_finished",
+    )
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialize_time = 0.0
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_count += 1
+
+    def header(self, total: float) -> str:
+        """
+        Формирует значение заголовка Server-Timing.
+
+        :param total: Полное время обработки запроса в секундах.
+        :return: Строка заголовка.
+        """
+        metrics = [
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.sql_count} queries"'
+        ]
+        if self.view_started is not None and self.view_finished is not None:
+            view = self.view_finished - self.view_started - self.serialize_time
+            metrics.append(f"view;dur={view * 1000:.2f}")
+        if self.serialize_time:
+            metrics.append(f"serialize;dur={self.serialize_time * 1000:.2f}")
+        if self.view_finished is not None and self.render_finished is not None:
+            render = self.render_finished - self.view_finished
+            metrics.append(f"render;dur={render * 1000:.2f}")
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+class StackSampler(threading.Thread):
+    """
+    Статистический профилировщик: периодически снимает стек заданного потока
+    и накапливает его в формате folded stacks (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname} ({code.co_filename})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        """
+        Останавливает сбор и возвращает накопленные стеки.
+
+        :return: Counter вида {свернутый стек: число сэмплов}.
+        """
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class ServerTimingMiddleware:
+    """
+    Добавляет заголовок Server-Timing с временем SQL, view, сериализации и
+    рендеринга, а для части запросов снимает профиль и сохраняет его.
+
+    Заголовок и профиль получают только staff-пользователи, запросы с
+    секретом PROFILING["FORCE_TOKEN"] в заголовке FORCE_HEADER и любые
+    запросы при DEBUG. Принудительно профиль снимается только по секрету.
+
+    Если PROFILING["ENABLED"] выключен, middleware исключается Django при старте.
+    В асинхронном режиме (ASGI) профиль и время SQL не снимаются: синхронный
+    код выполняется в потоках sync_to_async, отдается только время view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = getattr(settings, "PROFILING", {})
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.sample_rate = config.get("SAMPLE_RATE", 0.0)
+        self.interval = config.get("INTERVAL", 0.005)
+        self.output_dir = Path(config.get("OUTPUT_DIR", "profiles"))
+        self.force_header = config.get("FORCE_HEADER", "X-Profile")
+        self.force_token = config.get("FORCE_TOKEN", "")
+
+    def _is_forced(self, request) -> bool:
+        value = request.headers.get(self.force_header)
+        if not self.force_token or not value:
+            return False
+        return hmac.compare_digest(value.encode(), self.force_token.encode())
+
+    def _should_sample(self, forced: bool) -> bool:
+        if forced:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _is_staff(self, request) -> bool:
+        user = getattr(request, "user", None)
+        return bool(user and user.is_authenticated and user.is_staff)
+
+    def _is_privileged(self, request, forced: bool) -> bool:
+        # request.user проверяется после ответа: JWT-аутентификация DRF
+        # выполняется внутри view.
+        return settings.DEBUG or forced or self._is_staff(request)
+
+    def _dump(self, request, stacks: Counter):
+        """
+        Сохраняет профиль запроса в файл формата folded stacks.
+
+        :param request: HTTP-запрос.
+        :param stacks: Накопленные стеки.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        slug = request.path.strip("/").replace("/", "_") or "root"
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        path = self.output_dir / f"{stamp}-{request.method}-{slug}.folded"
+        with path.open("w") as fh:
+            for stack, count in stacks.items():
+                fh.write(f"{stack} {count}\n")
+        logger.info(f"Profile saved to {path}")
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        request.server_timings = timings
+        forced = self._is_forced(request)
+        sampler = None
+        if self._should_sample(forced):
+            sampler = StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+
+        started = time.perf_counter()
+        token = current_timings.set(timings)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+            stacks = sampler.stop() if sampler else None
+        total = time.perf_counter() - started
+
+        if self._is_privileged(request, forced):
+            if stacks:
+                self._dump(request, stacks)
+            response["Server-Timing"] = timings.header(total)
+        return response
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        request.server_timings = timings
+        started = time.perf_counter()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total = time.perf_counter() - started
+        if self._is_privileged(request, self._is_forced(request)):
+            response["Server-Timing"] = timings.header(total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.server_timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request.server_timings
+        timings.view_finished = time.perf_counter()
+
+        def mark_rendered(rendered):
+            timings.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(mark_rendered)
+        return response
+
+
+class PrometheusMiddleware:
+    """
+    Собирает метрики Prometheus по HTTP-запросам: задержку по view,
+    число запросов в обработке и число SQL-запросов (SQL — только в
+    синхронном режиме).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _method(request) -> str:
+        # Метод приходит от клиента: произвольные значения размножили бы
+        # временные ряды метрик.
+        method = request.method
+        return method if method in METRIC_METHODS else "other"
+
+    def _observe(self, request, status, started, timings=None):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        method = self._method(request)
+        HTTP_REQUEST_DURATION.labels(view, method, status).observe(
+            time.perf_counter() - started
+        )
+        if timings is not None:
+            DB_QUERIES_PER_REQUEST.labels(view).observe(timings.sql_count)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(self._method(request))
+        in_progress.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(timings))
+                response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            in_progress.dec()
+            self._observe(request, status, started, timings)
+
+    async def __acall__(self, request):
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(self._method(request))
+        in_progress.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            in_progress.dec()
+            self._observe(request, status, started)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Сбрасывает закрепление за основной базой в начале каждого запроса.
+    Небезопасные методы сразу читают из основной базы, чтобы видеть свои записи.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS["ALIASES"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = pin_to_primary(request.method not in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_pinning(token)
+
+    async def __acall__(self, request):
+        # Контекст запроса копируется в потоки sync_to_async, поэтому
+        # закрепление действует и для синхронного кода view.
+        token = pin_to_primary(request.method not in SAFE_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_pinning(token)
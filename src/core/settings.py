@@ -1,3 +1,4 @@
+from copy import deepcopy
 from datetime import timedelta
 from pathlib import Path
 import os
@@ -24,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "events",
     "rest_framework",
     "django_filters",
@@ -34,6 +36,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.ReplicaPinningMiddleware",
+    "core.middleware.PrometheusMiddleware",
+    "core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -62,6 +67,27 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "True") == "True"
+
+if DB_POOL_ENABLED:
+    # Пул psycopg 3 несовместим с CONN_MAX_AGE: соединения живут в пуле,
+    # а Django возвращает их туда в конце запроса или задачи. Проверку
+    # соединения перед выдачей (check) Django включает сам по
+    # CONN_HEALTH_CHECKS.
+    DB_OPTIONS = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        },
+    }
+    DB_CONN_MAX_AGE = 0
+else:
+    DB_OPTIONS = {}
+    DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+
 DATABASES = {
     "default": {
         "ENGINE": os.getenv("DB_ENGINE", "django.db.backends.postgresql"),
@@ -70,9 +96,45 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
         "HOST": os.getenv("DB_HOST", "db"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": DB_OPTIONS,
     }
 }
 
+# Реплики задаются списком host[:port] через запятую; остальные параметры
+# подключения совпадают с default. Для локальной проверки достаточно
+# DB_REPLICA_HOSTS=db: вторая алиас-база будет смотреть в ту же БД.
+DB_REPLICA_HOSTS = [
+    host.strip()
+    for host in os.getenv("DB_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+]
+# Недоступная реплика не должна задерживать запрос дольше
+# DB_REPLICA_CONNECT_TIMEOUT: столько ждут и подключения, и соединения из пула.
+DB_REPLICA_CONNECT_TIMEOUT = int(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "2"))
+for index, replica in enumerate(DB_REPLICA_HOSTS, start=1):
+    replica_host, _, replica_port = replica.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **deepcopy(DATABASES["default"]),
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    replica_options = DATABASES[f"replica_{index}"]["OPTIONS"]
+    replica_options["connect_timeout"] = DB_REPLICA_CONNECT_TIMEOUT
+    if "pool" in replica_options:
+        replica_options["pool"]["timeout"] = float(DB_REPLICA_CONNECT_TIMEOUT)
+
+DATABASE_REPLICAS = {
+    "ALIASES": [f"replica_{i}" for i in range(1, len(DB_REPLICA_HOSTS) + 1)],
+    "APPS": ["events"],
+    "MAX_LAG": float(os.getenv("DB_REPLICA_MAX_LAG", "5")),
+    "CHECK_INTERVAL": float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10")),
+}
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -128,16 +190,142 @@ CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv(
     "CELERY_RESULT_BACKEND", "redis://redis:6379/0"
 )
+# Без этого параметра Django-фикстура Celery обрабатывает соединения перед
+# каждой задачей и после нее, а с ним — раз в CELERY_DB_REUSE_MAX задач.
+# В закрепленной celery 5.5.3 она лишь закрывает непригодные и устаревшие
+# соединения, как и сигналы задач (core.celery), и пул не пересоздает;
+# начиная с celery 5.6 в prefork она закрывает весь пул (close_pool), и
+# параметр не дает делать это на каждой задаче.
+CELERY_DB_REUSE_MAX = int(os.getenv("CELERY_DB_REUSE_MAX", "1000"))
 CELERY_BEAT_SCHEDULE = {
     "cleanup-old-events-every-day": {
         "task": "events.tasks.cleanup_old_events",
         "schedule": 86400.0,
     },
+    "refresh-venue-stats-every-5-minutes": {
+        "task": "events.tasks.refresh_venue_stats",
+        "schedule": 300.0,
+    },
+}
+
+EVENT_CLEANUP_DAYS = int(os.getenv("EVENT_CLEANUP_DAYS", "7"))
+EVENT_TOMBSTONE_DAYS = int(os.getenv("EVENT_TOMBSTONE_DAYS", "30"))
+
+# Перед удалением cleanup_old_events выгружает события в архив
+# (gzip NDJSON по дням) в хранилище STORAGES["archive"].
+EVENTS_ARCHIVE = {
+    "ENABLED": os.getenv("EVENTS_ARCHIVE_ENABLED", "True") == "True",
+    "PREFIX": "events",
+    "CHUNK_SIZE": 5000,
+}
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Для объектного хранилища (S3-совместимого) укажите бэкенд
+    # django-storages и его OPTIONS.
+    "archive": {
+        "BACKEND": os.getenv(
+            "EVENTS_ARCHIVE_STORAGE",
+            "django.core.files.storage.FileSystemStorage",
+        ),
+        "OPTIONS": {
+            "location": os.getenv(
+                "EVENTS_ARCHIVE_ROOT", str(BASE_DIR.parent / "archive")
+            ),
+        },
+    },
 }
 
+EVENTS_STREAM = {
+    "REDIS_URL": os.getenv("EVENTS_STREAM_REDIS_URL", CELERY_BROKER_URL),
+    "CHANNEL": "events:changes",
+    "LOG_KEY": "events:changes:log",
+    "LOG_MAXLEN": 10000,
+    "BATCH_SIZE": 500,
+    "QUEUE_SIZE": 100,
+    "HEARTBEAT": 15,
+    "RETRY_MS": 3000,
+}
+
+EVENTS_SNAPSHOT = {
+    "ENABLED": os.getenv("EVENTS_SNAPSHOT_ENABLED", "False") == "True",
+    "HORIZON_DAYS": int(os.getenv("EVENTS_SNAPSHOT_HORIZON_DAYS", "28")),
+    "CHECK_INTERVAL": 1.0,
+    "MAX_AGE": 3600,
+}
+
+CHANGES_FEED = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 5000,
+    "SAFETY_LAG": 5,
+}
+
+EVENTS_FULLTEXT_SEARCH = (
+    os.getenv("EVENTS_FULLTEXT_SEARCH", "True") == "True"
+)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+
 EVENTS_FACE = {
-    "BASE_URL": "https://events.k3scluster.tech/api/events/",
+    "BASE_URL": os.getenv(
+        "EVENTS_FACE_BASE_URL", "https://events.k3scluster.tech/api/events/"
+    ),
     "MAX_RETRIES": 3,
     "BATCH_SIZE": 500,
     "TIMEOUT": 10,
+    "BACKFILL_WORKERS": 4,
+    # Кэш валидаторов страниц поставщика (ETag, Last-Modified, хэш тела).
+    "PAGE_CACHE_ENABLED": os.getenv("EVENTS_FACE_PAGE_CACHE", "True") == "True",
+    "PAGE_CACHE_DIR": os.getenv(
+        "EVENTS_FACE_PAGE_CACHE_DIR", str(BASE_DIR.parent / ".cache" / "provider")
+    ),
+    "PAGE_CACHE_MAX_BYTES": int(
+        os.getenv("EVENTS_FACE_PAGE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+    ),
+}
+
+PROFILING = {
+    "ENABLED": os.getenv("PROFILING_ENABLED", "False") == "True",
+    "SAMPLE_RATE": float(os.getenv("PROFILING_SAMPLE_RATE", "0")),
+    "INTERVAL": float(os.getenv("PROFILING_INTERVAL", "0.005")),
+    "OUTPUT_DIR": os.getenv(
+        "PROFILING_OUTPUT_DIR", str(BASE_DIR.parent / "profiles")
+    ),
+    "FORCE_HEADER": "X-Profile",
+    # Значение заголовка FORCE_HEADER, включающее профиль запроса; пустая
+    # строка отключает принудительное профилирование.
+    "FORCE_TOKEN": os.getenv("PROFILING_FORCE_TOKEN", ""),
+}
+
+# Бюджеты времени импорта при холодном старте. ARGV — аргументы реального
+# запуска команды против заглушки поставщика (None — только загрузка класса,
+# если команде нужна база); IMPORTS — модули, которые команда импортирует
+# лениво на пути записи.
+STARTUP_BUDGETS_MS = {
+    "sync_events": {
+        "APP": "sync",
+        "BUDGET": int(os.getenv("STARTUP_BUDGET_SYNC_MS", "800")),
+        "ARGV": ["--dry-run", "--no-cache"],
+        "IMPORTS": ["events.realtime", "events.search", "events.venue_stats"],
+    },
+    "cleanup_old_events": {
+        "APP": "events",
+        "BUDGET": int(os.getenv("STARTUP_BUDGET_CLEANUP_MS", "800")),
+        "ARGV": None,
+        "IMPORTS": ["events.cleanup"],
+    },
+}
+
+EVENTS_BENCHMARK = {
+    "P50_MS": int(os.getenv("BENCH_P50_MS", "50")),
+    "P95_MS": int(os.getenv("BENCH_P95_MS", "150")),
+    "P99_MS": int(os.getenv("BENCH_P99_MS", "300")),
+    "MAX_QUERIES": int(os.getenv("BENCH_MAX_QUERIES", "4")),
+    "MAX_ROWS": int(os.getenv("BENCH_MAX_ROWS", "50")),
+    "MIN_RPS": int(os.getenv("BENCH_MIN_RPS", "20")),
 }
@@ -0,0 +1,26 @@
+# Облегченный профиль настроек для management-команд и воркеров Celery:
+# без админки, DRF, JWT и прочих приложений веб-слоя, которые не нужны
+# sync_events, cleanup_old_events и задачам Celery, но замедляют старт.
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS
+
+WEB_ONLY_APPS = {
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "rest_framework",
+    "django_filters",
+    "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
+    "authapp",
+}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WEB_ONLY_APPS]
+
+ROOT_URLCONF = "core.urls_cli"
+
+MIDDLEWARE = []
+
+TEMPLATES = []
@@ -0,0 +1,5 @@
+# Пустой URLconf профиля core.settings_cli: команды и воркеры Celery не
+# обслуживают HTTP, а src/urls.py ссылается на админку и DRF, которых
+# в этом профиле нет.
+
+urlpatterns = []
@@ -0,0 +1,11 @@
+from django.http import HttpResponse
+
+from common.metrics import render_latest
+
+
+def metrics_view(request):
+    """
+    Отдает метрики в формате экспозиции Prometheus.
+    """
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
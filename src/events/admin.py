@@ -1,16 +1,150 @@
-from django.contrib import admin
+from itertools import islice
 
-from .models import Event, Venue
+from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from common.paginators import EstimatedCountPaginator
+
+from .models import Event, EventTombstone, StatusEnum, Venue
+from .realtime import bump_generation, event_payload, publish_changes
+from .venue_stats import refresh_venue_stats
+
+PUBLISH_BATCH_SIZE = 2000
+
+
+def _truncate(value, kind: str):
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind in ("year", "month"):
+        value = value.replace(day=1)
+    if kind == "year":
+        value = value.replace(month=1)
+    return value
+
+
+def _next_period(start, kind: str):
+    if kind == "year":
+        return start.replace(year=start.year + 1)
+    if kind == "month":
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    return start + timezone.timedelta(days=1)
+
+
+class IndexedDatesQuerySet(QuerySet):
+    """
+    QuerySet списка изменений, у которого datetimes() для date_hierarchy
+    перебирает периоды поиском по индексу (ORDER BY ... LIMIT 1 от начала
+    следующего периода) вместо SELECT DISTINCT date_trunc(...) по всей таблице.
+    """
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month", "day"):
+            return super().datetimes(field_name, kind, order, tzinfo)
+        tz = tzinfo or timezone.get_current_timezone()
+        values = self.order_by(field_name).values_list(field_name, flat=True)
+        periods = []
+        value = values.first()
+        while value is not None:
+            start = _truncate(timezone.localtime(value, tz), kind)
+            periods.append(start)
+            value = values.filter(
+                **{f"{field_name}__gte": _next_period(start, kind)}
+            ).first()
+        if order == "DESC":
+            periods.reverse()
+        return periods
 
 
 @admin.register(Venue)
 class VenueAdmin(admin.ModelAdmin):
     list_display = ("name",)
     search_fields = ("name",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ("name", "event_time", "status", "venue")
     list_filter = ("status", "event_time")
+    list_select_related = ("venue",)
     search_fields = ("name",)
+    autocomplete_fields = ("venue",)
+    date_hierarchy = "event_time"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ("mark_open", "mark_closed")
+
+    def get_queryset(self, request):
+        queryset = IndexedDatesQuerySet(self.model)
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_actions(self, request):
+        # Массовое удаление обходит отметки об удалении, счетчики площадок
+        # и публикацию изменений, а его страница подтверждения перечисляет
+        # все выбранные объекты. Старые события удаляет cleanup_old_events.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def delete_model(self, request, obj):
+        event_id, venue_id = obj.pk, obj.venue_id
+        with transaction.atomic():
+            EventTombstone.objects.update_or_create(
+                event_id=event_id, defaults={"deleted_at": timezone.now()}
+            )
+            super().delete_model(request, obj)
+            if venue_id is not None:
+                refresh_venue_stats([venue_id])
+            publish_changes(deleted=[event_id])
+            bump_generation()
+
+    def _set_status(self, request, queryset, status: str):
+        changed_at = timezone.now()
+        queryset = queryset.exclude(status=status)
+        with transaction.atomic():
+            venue_ids = set(
+                queryset.exclude(venue__isnull=True)
+                .order_by()
+                .values_list("venue_id", flat=True)
+                .distinct()
+            )
+            updated = queryset.update(status=status, updated_at=changed_at)
+            if updated:
+                refresh_venue_stats(venue_ids)
+                bump_generation()
+        if updated:
+            # Измененные строки находятся по updated_at через индекс
+            # event_updated_at_id_idx. Публикация идет после фиксации: вне
+            # транзакции publish_changes отправляет пакет сразу, поэтому в
+            # памяти находится только один пакет событий.
+            changed = (
+                Event.objects.select_related("venue")
+                .filter(updated_at=changed_at, status=status)
+                .iterator(chunk_size=PUBLISH_BATCH_SIZE)
+            )
+            while batch := list(islice(changed, PUBLISH_BATCH_SIZE)):
+                publish_changes(
+                    updated=[event_payload(e, e.venue) for e in batch]
+                )
+        self.message_user(
+            request, f"Events updated: {updated}", messages.SUCCESS
+        )
+
+    @admin.action(
+        description="Mark selected events as open", permissions=["change"]
+    )
+    def mark_open(self, request, queryset):
+        self._set_status(request, queryset, StatusEnum.OPEN.value)
+
+    @admin.action(
+        description="Mark selected events as closed", permissions=["change"]
+    )
+    def mark_closed(self, request, queryset):
+        self._set_status(request, queryset, StatusEnum.CLOSED.value)
@@ -0,0 +1,161 @@
+import gzip
+import json
+import tempfile
+from datetime import date
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_FIELDS = (
+    "id",
+    "name",
+    "event_time",
+    "status",
+    "updated_at",
+    "venue_id",
+    "venue__name",
+)
+
+
+def partition_dir(day: date) -> str:
+    return f"{settings.EVENTS_ARCHIVE['PREFIX']}/date={day.isoformat()}"
+
+
+def discard_archive(names):
+    """
+    Удаляет файлы архива, записанные в неудавшемся запуске.
+    """
+    storage = storages["archive"]
+    for name in names:
+        storage.delete(name)
+
+
+def _record(row) -> dict:
+    event_id, name, event_time, status, updated_at, venue_id, venue_name = row
+    return {
+        "id": event_id,
+        "name": name,
+        "event_time": event_time,
+        "status": status,
+        "updated_at": updated_at,
+        "venue": (
+            {"id": venue_id, "name": venue_name}
+            if venue_id is not None
+            else None
+        ),
+    }
+
+
+def archive_events(queryset, run_at) -> tuple[int, list[str]]:
+    """
+    Выгружает события с данными площадок в архив: по одному файлу gzip NDJSON
+    на день event_time (UTC) в каталоге date=YYYY-MM-DD. Строки читаются
+    потоком и сжимаются во временный файл, поэтому память не зависит от
+    объема выгрузки. При ошибке уже записанные файлы удаляются.
+
+    :param queryset: События для архивации.
+    :param run_at: Время запуска, входит в имена файлов.
+    :return: Количество выгруженных событий и имена записанных файлов.
+    """
+    storage = storages["archive"]
+    rows = (
+        queryset.order_by("event_time", "id")
+        .values_list(*ARCHIVE_FIELDS)
+        .iterator(chunk_size=settings.EVENTS_ARCHIVE["CHUNK_SIZE"])
+    )
+    part = f"part-{run_at:%Y%m%dT%H%M%S%f}.ndjson.gz"
+    written = []
+    count = 0
+    day = None
+    tmp = None
+    archive = None
+
+    def save():
+        archive.close()
+        tmp.seek(0)
+        written.append(storage.save(f"{partition_dir(day)}/{part}", File(tmp)))
+        tmp.close()
+
+    try:
+        for row in rows:
+            row_day = row[2].astimezone(dt_timezone.utc).date()
+            if row_day != day:
+                if archive is not None:
+                    save()
+                day = row_day
+                tmp = tempfile.TemporaryFile()
+                archive = gzip.GzipFile(fileobj=tmp, mode="wb")
+            line = json.dumps(_record(row), cls=DjangoJSONEncoder)
+            archive.write(line.encode() + b"\n")
+            count += 1
+        if archive is not None:
+            save()
+    except Exception:
+        if tmp is not None:
+            tmp.close()
+        discard_archive(written)
+        raise
+    logger.info(f"Archived {count} events into {len(written)} files")
+    return count, written
+
+
+def archived_days(date_from: date, date_to: date) -> list[date]:
+    """
+    Возвращает дни диапазона, для которых в архиве есть данные.
+    """
+    storage = storages["archive"]
+    prefix = settings.EVENTS_ARCHIVE["PREFIX"]
+    try:
+        directories, _ = storage.listdir(prefix)
+    except FileNotFoundError:
+        return []
+    days = []
+    for directory in directories:
+        try:
+            day = date.fromisoformat(directory.removeprefix("date="))
+        except ValueError:
+            continue
+        if date_from <= day <= date_to:
+            days.append(day)
+    return sorted(days)
+
+
+def iter_archived_events(date_from: date, date_to: date):
+    """
+    Читает архивные события за диапазон дней потоком, не загружая их в базу.
+    Событие, выгруженное повторно (например, после отката удаления), отдается
+    один раз — в версии с наибольшим updated_at.
+
+    :param date_from: Первый день диапазона (по event_time, UTC).
+    :param date_to: Последний день диапазона (включительно).
+    :return: Итератор словарей событий в порядке event_time.
+    """
+    storage = storages["archive"]
+    for day in archived_days(date_from, date_to):
+        directory = partition_dir(day)
+        _, files = storage.listdir(directory)
+        events = {}
+        for name in sorted(files):
+            with storage.open(f"{directory}/{name}", "rb") as raw:
+                with gzip.open(raw, "rt", encoding="utf-8") as lines:
+                    for line in lines:
+                        event = json.loads(line)
+                        current = events.get(event["id"])
+                        if current is None or (
+                            parse_datetime(event["updated_at"])
+                            >= parse_datetime(current["updated_at"])
+                        ):
+                            events[event["id"]] = event
+        yield from sorted(
+            events.values(),
+            key=lambda e: (parse_datetime(e["event_time"]), e["id"]),
+        )
+
@@ -0,0 +1,142 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.db_router import pin_to_primary, reset_pinning
+
+from .models import Event, EventTombstone
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ExpiredCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment: datetime, object_id: uuid.UUID) -> str:
+    """
+    Кодирует позицию в ленте изменений в непрозрачную строку.
+
+    :param moment: Время последнего изменения.
+    :param object_id: Идентификатор последнего события.
+    :return: Курсор.
+    """
+    raw = f"{moment.isoformat()}|{object_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(value: str) -> tuple[datetime, uuid.UUID | None]:
+    """
+    Разбирает курсор, выданный encode_cursor, или дату в формате ISO 8601.
+
+    :param value: Значение параметра ?changed_since=.
+    :return: Время и идентификатор (None для даты без идентификатора).
+    :raises InvalidCursor: Если значение не удалось разобрать.
+    """
+    try:
+        # Для строки правильного формата с несуществующей датой
+        # (2024-02-30) parse_datetime бросает ValueError, а не возвращает None.
+        moment = parse_datetime(value)
+    except ValueError:
+        raise InvalidCursor(value)
+    if moment is not None:
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, dt_timezone.utc)
+        return moment, None
+    try:
+        raw = base64.urlsafe_b64decode(value.encode()).decode()
+        moment_raw, object_id = raw.split("|", 1)
+        moment = parse_datetime(moment_raw)
+        object_id = uuid.UUID(object_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(value)
+    if moment is None:
+        raise InvalidCursor(value)
+    return moment, object_id
+
+
+def _after(time_field: str, id_field: str, moment, object_id) -> Q:
+    if object_id is None:
+        return Q(**{f"{time_field}__gt": moment})
+    return Q(**{f"{time_field}__gt": moment}) | Q(
+        **{time_field: moment, f"{id_field}__gt": object_id}
+    )
+
+
+def get_changes(changed_since: str, limit: int) -> dict:
+    """
+    Возвращает изменения и удаления событий после курсора в порядке
+    (время изменения, id).
+
+    Изменения моложе CHANGES_FEED["SAFETY_LAG"] секунд не отдаются, чтобы
+    транзакции, закоммиченные не в порядке своих отметок времени, не были
+    пропущены курсором. Лента читается из основной базы: отставание
+    реплики сдвинуло бы видимость строк дальше этого окна.
+
+    :param changed_since: Курсор или дата ISO 8601.
+    :param limit: Максимальное количество записей в ответе.
+    :return: Словарь с upserts, deletes, next_cursor и has_more.
+    :raises InvalidCursor: Если курсор не удалось разобрать.
+    :raises ExpiredCursor: Если отметки об удалении за этот период уже удалены.
+    """
+    moment, object_id = decode_cursor(changed_since)
+    now = timezone.now()
+    retention = timezone.timedelta(days=settings.EVENT_TOMBSTONE_DAYS)
+    if moment < now - retention:
+        raise ExpiredCursor(changed_since)
+    horizon = now - timezone.timedelta(
+        seconds=settings.CHANGES_FEED["SAFETY_LAG"]
+    )
+
+    token = pin_to_primary()
+    try:
+        upserts = list(
+            Event.objects.select_related("venue")
+            .filter(_after("updated_at", "id", moment, object_id))
+            .filter(updated_at__lte=horizon)
+            .order_by("updated_at", "id")[: limit + 1]
+        )
+        deletes = list(
+            EventTombstone.objects.filter(
+                _after("deleted_at", "event_id", moment, object_id)
+            )
+            .filter(deleted_at__lte=horizon)
+            .order_by("deleted_at", "event_id")[: limit + 1]
+        )
+    finally:
+        reset_pinning(token)
+
+    merged = sorted(
+        [(e.updated_at, e.id, e) for e in upserts]
+        + [(t.deleted_at, t.event_id, t) for t in deletes],
+        key=lambda item: (item[0], item[1]),
+    )
+    has_more = len(merged) > limit
+    page = merged[:limit]
+
+    if page:
+        last_moment, last_id, _ = page[-1]
+        next_cursor = encode_cursor(last_moment, last_id)
+    else:
+        next_cursor = (
+            encode_cursor(moment, object_id)
+            if object_id is not None
+            else changed_since
+        )
+    return {
+        "upserts": [obj for _, _, obj in page if isinstance(obj, Event)],
+        "deletes": [
+            obj for _, _, obj in page if isinstance(obj, EventTombstone)
+        ],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
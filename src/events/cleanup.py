@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from common.metrics import CLEANUP_DELETED_EVENTS
+from core.db_router import pin_to_primary, reset_pinning
+
+from .archive import archive_events, discard_archive
+from .models import Event, EventTombstone
+from .realtime import bump_generation, publish_changes
+from .venue_stats import refresh_venue_stats
+
+DELETE_BATCH_SIZE = 5000
+
+DELETE_BATCH_SQL = """
+    WITH batch AS (
+        SELECT id FROM events_event
+        WHERE event_time < %(cutoff)s AND updated_at < %(horizon)s
+        ORDER BY id
+        LIMIT %(limit)s
+        FOR UPDATE
+    ), tombstones AS (
+        INSERT INTO events_eventtombstone (event_id, deleted_at)
+        SELECT id, %(deleted_at)s FROM batch
+        ON CONFLICT (event_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at
+    )
+    DELETE FROM events_event AS e
+    USING batch
+    WHERE e.id = batch.id
+    RETURNING e.id, e.venue_id
+"""
+
+
+def _delete_batch(cutoff, horizon) -> list[tuple]:
+    """
+    Удаляет пакет старых событий и оставляет для них отметки об удалении
+    в одной короткой транзакции. Время отметки берется внутри нее, поэтому
+    отметка не старше фиксации больше чем на время пакета — в пределах
+    CHANGES_FEED["SAFETY_LAG"], и лента изменений ее не пропустит.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                DELETE_BATCH_SQL,
+                {
+                    "cutoff": cutoff,
+                    "horizon": horizon,
+                    "limit": DELETE_BATCH_SIZE,
+                    "deleted_at": timezone.now(),
+                },
+            )
+            rows = cursor.fetchall()
+        publish_changes(deleted=[event_id for event_id, _ in rows])
+    return rows
+
+
+def delete_old_events(days: int) -> int:
+    """
+    Удаляет события старше days дней, оставляя для них отметки об удалении,
+    и пересчитывает счетчики затронутых площадок. Если архив включен,
+    события сначала выгружаются в него; ошибка выгрузки отменяет удаление.
+
+    :param days: Срок хранения событий в днях.
+    :return: Количество удаленных событий.
+    """
+    run_at = timezone.now()
+    cutoff = run_at - timezone.timedelta(days=days)
+    # Выгрузка — один запрос, то есть один снимок данных. Строки, измененные
+    # позже horizon, в него могли не попасть (транзакция фиксируется позже
+    # своей отметки updated_at), поэтому ни выгрузка, ни удаление их не
+    # трогают: они уйдут при следующем запуске.
+    horizon = run_at - timezone.timedelta(
+        seconds=settings.CHANGES_FEED["SAFETY_LAG"]
+    )
+    archived = []
+    deleted_count = 0
+    venue_ids = set()
+    token = pin_to_primary()
+    try:
+        if settings.EVENTS_ARCHIVE["ENABLED"]:
+            _, archived = archive_events(
+                Event.objects.filter(
+                    event_time__lt=cutoff, updated_at__lt=horizon
+                ),
+                run_at=run_at,
+            )
+        while True:
+            try:
+                rows = _delete_batch(cutoff, horizon)
+            except Exception:
+                # Пока ни один пакет не удален, архив не нужен. После этого
+                # файлы оставляем: удаленные события есть только в них, а
+                # оставшиеся будут выгружены повторно — при чтении архива
+                # дубликаты схлопываются по updated_at.
+                if not deleted_count:
+                    discard_archive(archived)
+                raise
+            deleted_count += len(rows)
+            venue_ids.update(venue_id for _, venue_id in rows if venue_id)
+            if len(rows) < DELETE_BATCH_SIZE:
+                break
+        refresh_venue_stats(venue_ids)
+        EventTombstone.objects.filter(
+            deleted_at__lt=run_at
+            - timezone.timedelta(days=settings.EVENT_TOMBSTONE_DAYS)
+        ).delete()
+        bump_generation()
+    finally:
+        reset_pinning(token)
+        CLEANUP_DELETED_EVENTS.inc(deleted_count)
+    return deleted_count
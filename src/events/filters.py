@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .search import build_search_query
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Полнотекстовый поиск по Event.search_vector с ранжированием.
+
+    Сохраняет контракт параметра ?search= из SearchFilter. Без явного
+    ?ordering= результаты сортируются по релевантности. При выключенном
+    EVENTS_FULLTEXT_SEARCH работает как обычный SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not settings.EVENTS_FULLTEXT_SEARCH:
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(self.get_search_terms(request))
+        if query is None:
+            return queryset
+
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("-search_rank", "event_time")
+        return queryset
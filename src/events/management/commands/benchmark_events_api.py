@@ -0,0 +1,343 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events.models import Venue
+
+BUDGETS = getattr(settings, "EVENTS_BENCHMARK", {})
+
+SCENARIOS = [
+    ("list", {}),
+    ("status", {"status": "open"}),
+    ("ordering", {"ordering": "-event_time"}),
+    ("search", {"search": "jazz"}),
+    ("search_venue", {"search": "Kazan"}),
+    ("search_prefix", {"search": "co"}),
+    ("venue_name", {"venue__name": "{venue_name}"}),
+    ("status_search", {"status": "closed", "search": "festival"}),
+    ("deep_page", {"status": "open", "page": "200"}),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Возвращает перцентиль по методу ближайшего ранга.
+
+    :param values: Список значений.
+    :param pct: Перцентиль от 0 до 100.
+    :return: Значение перцентиля или 0.0 для пустого списка.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class QueryCounter:
+    """
+    Обертка execute_wrapper, считающая SQL-запросы и возвращенные строки.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        rowcount = context["cursor"].rowcount
+        if rowcount and rowcount > 0:
+            self.rows += rowcount
+        return result
+
+
+class ScenarioStats:
+    """
+    Накопленные замеры одного сценария.
+    """
+
+    def __init__(self, name: str, query: str):
+        self.name = name
+        self.query = query
+        self.latencies = []
+        self.queries = []
+        self.rows = []
+        self.errors = 0
+        self.wall_time = 0.0
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        return {
+            "name": self.name,
+            "requests": count,
+            "errors": self.errors,
+            "p50": percentile(self.latencies, 50),
+            "p95": percentile(self.latencies, 95),
+            "p99": percentile(self.latencies, 99),
+            "rps": count / self.wall_time if self.wall_time else 0.0,
+            "queries": max(self.queries) if self.queries else None,
+            "rows": max(self.rows) if self.rows else None,
+        }
+
+
+class Command(BaseCommand):
+    """
+    Замеряет задержку, пропускную способность и число SQL-запросов для /api/events/.
+    """
+
+    help = "Benchmark the /api/events/ read path against budgets"
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки для управления замерами.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--mode",
+            choices=["client", "http"],
+            default="client",
+            help="client: Django test client in-process, http: concurrent load",
+        )
+        parser.add_argument(
+            "--url",
+            type=str,
+            default="http://localhost:8000",
+            help="Server base URL for --mode http",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Requests per scenario (default: 50)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Concurrent workers for --mode http (default: 8)",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            default=None,
+            help="Run only the named scenario (can be repeated)",
+        )
+        parser.add_argument(
+            "--label",
+            type=str,
+            default="",
+            help="Free-form label printed with the report",
+        )
+        parser.add_argument(
+            "--no-budgets",
+            action="store_true",
+            help="Report only, do not fail when budgets are exceeded",
+        )
+
+    def _token(self) -> str:
+        """
+        Создает служебного пользователя и возвращает access-токен для него.
+
+        :return: JWT access-токен.
+        """
+        user, created = User.objects.get_or_create(username="benchmark")
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+        return str(RefreshToken.for_user(user).access_token)
+
+    def _scenarios(self, only) -> list[tuple[str, str]]:
+        """
+        Подставляет реальные значения в параметры сценариев и кодирует
+        их в строку запроса.
+
+        :param only: Список имен сценариев или None.
+        :return: Список пар (имя, строка запроса).
+        """
+        venue = Venue.objects.order_by("id").first()
+        venue_name = venue.name if venue else ""
+        scenarios = [
+            (
+                name,
+                urlencode(
+                    {
+                        key: value.format(venue_name=venue_name)
+                        for key, value in params.items()
+                    }
+                ),
+            )
+            for name, params in SCENARIOS
+        ]
+        if only:
+            unknown = set(only) - {name for name, _ in scenarios}
+            if unknown:
+                raise CommandError(
+                    f"Unknown scenario(s): {', '.join(sorted(unknown))}"
+                )
+            scenarios = [item for item in scenarios if item[0] in only]
+        return scenarios
+
+    def _run_client(self, stats: ScenarioStats, path: str, token: str):
+        """
+        Выполняет запросы через тестовый клиент Django, считая SQL и строки.
+
+        :param stats: Накопитель замеров.
+        :param path: Путь запроса со строкой параметров.
+        :param token: JWT access-токен.
+        """
+        client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_HOST="localhost"
+        )
+        started = time.perf_counter()
+        for _ in range(self.requests_count):
+            counter = QueryCounter()
+            t0 = time.perf_counter()
+            # Запросы считаются на всех алиасах: чтения списка идут на
+            # реплики, когда они настроены.
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(counter))
+                response = client.get(path)
+            stats.latencies.append((time.perf_counter() - t0) * 1000)
+            stats.queries.append(counter.queries)
+            stats.rows.append(counter.rows)
+            if response.status_code != 200:
+                stats.errors += 1
+        stats.wall_time = time.perf_counter() - started
+
+    def _run_http(self, stats: ScenarioStats, path: str, token: str):
+        """
+        Выполняет запросы к запущенному серверу из пула потоков.
+
+        :param stats: Накопитель замеров.
+        :param path: Путь запроса со строкой параметров.
+        :param token: JWT access-токен.
+        """
+        url = self.base_url.rstrip("/") + path
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def worker(count: int):
+            latencies = []
+            errors = 0
+            with requests.Session() as session:
+                for _ in range(count):
+                    t0 = time.perf_counter()
+                    try:
+                        response = session.get(
+                            url, headers=headers, timeout=30
+                        )
+                        ok = response.status_code == 200
+                    except requests.exceptions.RequestException:
+                        ok = False
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    if not ok:
+                        errors += 1
+            return latencies, errors
+
+        workers = max(1, self.concurrency)
+        share, extra = divmod(self.requests_count, workers)
+        counts = [share + (1 if i < extra else 0) for i in range(workers)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for latencies, errors in pool.map(worker, counts):
+                stats.latencies.extend(latencies)
+                stats.errors += errors
+        stats.wall_time = time.perf_counter() - started
+
+    def _check_budgets(self, summary: dict) -> list[str]:
+        """
+        Сравнивает результаты сценария с бюджетами из настроек.
+
+        :param summary: Сводка сценария.
+        :return: Список нарушений.
+        """
+        violations = []
+        name = summary["name"]
+        for key, budget_key in (
+            ("p50", "P50_MS"),
+            ("p95", "P95_MS"),
+            ("p99", "P99_MS"),
+        ):
+            budget = BUDGETS.get(budget_key)
+            if budget is not None and summary[key] > budget:
+                violations.append(
+                    f"{name}: {key} {summary[key]:.1f}ms > {budget}ms"
+                )
+        for key, budget_key in (("queries", "MAX_QUERIES"), ("rows", "MAX_ROWS")):
+            budget = BUDGETS.get(budget_key)
+            if (
+                budget is not None
+                and summary[key] is not None
+                and summary[key] > budget
+            ):
+                violations.append(f"{name}: {key} {summary[key]} > {budget}")
+        min_rps = BUDGETS.get("MIN_RPS")
+        if min_rps is not None and summary["rps"] < min_rps:
+            violations.append(
+                f"{name}: throughput {summary['rps']:.1f} rps < {min_rps} rps"
+            )
+        if summary["errors"]:
+            violations.append(f"{name}: {summary['errors']} failed requests")
+        return violations
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        self.requests_count = options["requests"]
+        self.concurrency = options["concurrency"]
+        self.base_url = options["url"]
+        mode = options["mode"]
+        if self.requests_count <= 0:
+            raise CommandError("--requests must be positive")
+
+        token = self._token()
+        base_path = reverse("event-list")
+        run = self._run_client if mode == "client" else self._run_http
+
+        title = f"Benchmark mode={mode}"
+        if options["label"]:
+            title += f" label={options['label']}"
+        self.stdout.write(self.style.NOTICE(title))
+        self.stdout.write(
+            f"{'scenario':<16}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'rps':>9}{'sql':>6}{'rows':>9}"
+        )
+
+        violations = []
+        for name, query in self._scenarios(options["scenario"]):
+            path = f"{base_path}?{query}" if query else base_path
+            stats = ScenarioStats(name, query)
+            run(stats, path, token)
+            summary = stats.summary()
+            queries = "-" if summary["queries"] is None else summary["queries"]
+            rows = "-" if summary["rows"] is None else summary["rows"]
+            self.stdout.write(
+                f"{name:<16}{summary['requests']:>6}{summary['p50']:>10.1f}"
+                f"{summary['p95']:>10.1f}{summary['p99']:>10.1f}"
+                f"{summary['rps']:>9.1f}{queries:>6}{rows:>9}"
+            )
+            violations.extend(self._check_budgets(summary))
+
+        if violations and not options["no_budgets"]:
+            for violation in violations:
+                self.stderr.write(self.style.ERROR(violation))
+            raise CommandError(f"{len(violations)} budget(s) exceeded")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -1,15 +1,13 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-
-from events.models import Event
 
 
 class Command(BaseCommand):
-    help = "Delete events that ended more than 7 days ago"
+    help = "Delete events older than EVENT_CLEANUP_DAYS days"
+    requires_system_checks = []
 
     def handle(self, *args, **options):
-        cutoff = timezone.now() - timezone.timedelta(days=7)
-        old_events = Event.objects.filter(event_time__lt=cutoff)
-        count = old_events.count()
-        old_events.delete()
+        from events.cleanup import delete_old_events
+
+        count = delete_old_events(days=settings.EVENT_CLEANUP_DAYS)
         self.stdout.write(self.style.SUCCESS(f"Deleted {count} old events"))
@@ -0,0 +1,143 @@
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+CSV_FIELDS = (
+    "id",
+    "name",
+    "event_time",
+    "status",
+    "updated_at",
+    "venue_id",
+    "venue_name",
+)
+
+
+class Command(BaseCommand):
+    """
+    Читает события из архива за диапазон дней и выгружает их в NDJSON/CSV
+    или выводит сводку по дням, не загружая их обратно в events_event.
+    """
+
+    help = "Query or export archived events for a date range"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            required=True,
+            help="First day of the range (event_time, UTC) in YYYY-MM-DD format",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            help="Last day of the range (inclusive), defaults to --from",
+        )
+        parser.add_argument(
+            "--status", choices=("open", "closed"), help="Filter by status"
+        )
+        parser.add_argument("--venue", help="Filter by venue id")
+        parser.add_argument(
+            "--name", help="Filter by case-insensitive substring of the name"
+        )
+        parser.add_argument(
+            "--format",
+            choices=("ndjson", "csv"),
+            default="ndjson",
+            help="Output format (default: ndjson)",
+        )
+        parser.add_argument(
+            "--output", help="Write to this file instead of stdout"
+        )
+        parser.add_argument(
+            "--summary",
+            action="store_true",
+            help="Print per-day counts instead of the events",
+        )
+
+    def _matches(self, event, options) -> bool:
+        if options["status"] and event["status"] != options["status"]:
+            return False
+        venue = event["venue"] or {}
+        if options["venue"] and venue.get("id") != options["venue"]:
+            return False
+        if options["name"] and options["name"].lower() not in event["name"].lower():
+            return False
+        return True
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        from events.archive import iter_archived_events
+
+        try:
+            date_from = datetime.strptime(options["date_from"], "%Y-%m-%d").date()
+            date_to = (
+                datetime.strptime(options["date_to"], "%Y-%m-%d").date()
+                if options["date_to"]
+                else date_from
+            )
+        except ValueError:
+            raise CommandError("Invalid date format")
+        if date_from > date_to:
+            raise CommandError("--from must not be later than --to")
+
+        events = (
+            event
+            for event in iter_archived_events(date_from, date_to)
+            if self._matches(event, options)
+        )
+
+        if options["summary"]:
+            totals = Counter()
+            for event in events:
+                totals[(event["event_time"][:10], event["status"])] += 1
+            for day in sorted({day for day, _ in totals}):
+                self.stdout.write(
+                    f"{day}  open {totals[(day, 'open')]:>8}  "
+                    f"closed {totals[(day, 'closed')]:>8}"
+                )
+            return
+
+        out = (
+            open(options["output"], "w", encoding="utf-8", newline="")
+            if options["output"]
+            else self.stdout
+        )
+        count = 0
+        try:
+            if options["format"] == "csv":
+                writer = csv.writer(out, lineterminator="\n")
+                writer.writerow(CSV_FIELDS)
+            for event in events:
+                if options["format"] == "csv":
+                    venue = event["venue"] or {}
+                    writer.writerow(
+                        [event[field] for field in CSV_FIELDS[:5]]
+                        + [venue.get("id"), venue.get("name")]
+                    )
+                else:
+                    out.write(json.dumps(event, ensure_ascii=False) + "\n")
+                count += 1
+        finally:
+            if out is not self.stdout:
+                out.close()
+        if options["output"]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Exported {count} archived events to {options['output']}"
+                )
+            )
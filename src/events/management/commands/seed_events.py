@@ -0,0 +1,169 @@
+import random
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import Event, StatusEnum, Venue
+from events.search import update_search_vectors
+from events.venue_stats import refresh_venue_stats
+
+WORDS = [
+    "jazz",
+    "rock",
+    "festival",
+    "conference",
+    "meetup",
+    "theatre",
+    "opera",
+    "lecture",
+    "workshop",
+    "exhibition",
+    "concert",
+    "marathon",
+    "forum",
+    "premiere",
+    "tour",
+    "night",
+    "summit",
+    "party",
+]
+CITIES = [
+    "Moscow",
+    "Kazan",
+    "Ufa",
+    "Samara",
+    "Perm",
+    "Omsk",
+    "Tomsk",
+    "Sochi",
+]
+
+
+class Command(BaseCommand):
+    """
+    Наполняет базу синтетическими площадками и событиями для нагрузочных замеров.
+    """
+
+    help = "Seed the database with synthetic venues and events for benchmarks"
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки для управления объемом данных.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--venues",
+            type=int,
+            default=5000,
+            help="Number of venues to create (default: 5000)",
+        )
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=2_000_000,
+            help="Number of events to create (default: 2000000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Batch size for bulk_create (default: 10000)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread event_time over +/- this many days (default: 365)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for reproducible data (default: 42)",
+        )
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete existing events and venues before seeding",
+        )
+
+    def _random_name(self, rnd: random.Random) -> str:
+        """
+        Генерирует название события из словаря, чтобы поиск находил совпадения.
+
+        :param rnd: Генератор случайных чисел.
+        :return: Название события.
+        """
+        return " ".join(rnd.choices(WORDS, k=3)).title()
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        venues_count = options["venues"]
+        events_count = options["events"]
+        batch_size = options["batch_size"]
+        days = options["days"]
+        if venues_count <= 0:
+            raise CommandError("--venues must be positive")
+        if events_count < 0:
+            raise CommandError("--events must not be negative")
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive")
+
+        rnd = random.Random(options["seed"])
+
+        if options["flush"]:
+            Event.objects.all().delete()
+            Venue.objects.all().delete()
+            self.stdout.write(self.style.WARNING("Existing data flushed"))
+
+        venues = [
+            Venue(
+                id=uuid.UUID(int=rnd.getrandbits(128), version=4),
+                name=f"{rnd.choice(CITIES)} Hall {i}",
+            )
+            for i in range(venues_count)
+        ]
+        with transaction.atomic():
+            Venue.objects.bulk_create(venues, batch_size=batch_size)
+        self.stdout.write(self.style.NOTICE(f"Venues created: {len(venues)}"))
+
+        now = timezone.now()
+        span = days * 24 * 3600
+        statuses = [status.value for status in StatusEnum]
+        created = 0
+        while created < events_count:
+            size = min(batch_size, events_count - created)
+            batch = [
+                Event(
+                    id=uuid.UUID(int=rnd.getrandbits(128), version=4),
+                    name=self._random_name(rnd),
+                    event_time=now + timedelta(seconds=rnd.randint(-span, span)),
+                    status=rnd.choice(statuses),
+                    venue=rnd.choice(venues),
+                )
+                for _ in range(size)
+            ]
+            with transaction.atomic():
+                Event.objects.bulk_create(batch, batch_size=batch_size)
+            created += size
+            self.stdout.write(f"Events created: {created}/{events_count}")
+
+        indexed = update_search_vectors()
+        self.stdout.write(f"Search vectors updated: {indexed}")
+        refreshed = refresh_venue_stats()
+        self.stdout.write(f"Venue stats refreshed: {refreshed}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeding complete. Venues: {venues_count}, Events: {created}"
+            )
+        )
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from events.snapshot import Snapshot
+
+
+class Command(BaseCommand):
+    """
+    Строит снимок предстоящих открытых событий и сообщает время построения
+    и занимаемую память.
+    """
+
+    help = "Build the upcoming-events snapshot and report its memory footprint"
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--horizon-days",
+            type=int,
+            default=settings.EVENTS_SNAPSHOT["HORIZON_DAYS"],
+            help="Snapshot window in days",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        tracemalloc.start()
+        started = time.perf_counter()
+        baseline, _ = tracemalloc.get_traced_memory()
+        snapshot = Snapshot.build(None, options["horizon_days"])
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        count = len(snapshot.records)
+        retained = current - baseline
+        self.stdout.write(f"Events in snapshot: {count}")
+        self.stdout.write(f"Build time: {elapsed:.2f} s")
+        self.stdout.write(f"Retained memory: {retained / 1024 / 1024:.1f} MiB")
+        self.stdout.write(
+            f"Peak memory during build: {(peak - baseline) / 1024 / 1024:.1f} MiB"
+        )
+        if count:
+            per_100k = retained / count * 100_000
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Memory per 100k events: {per_100k / 1024 / 1024:.1f} MiB"
+                )
+            )
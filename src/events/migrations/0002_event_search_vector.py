@@ -0,0 +1,36 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+BACKFILL_SQL = """
+    UPDATE events_event AS e
+    SET search_vector =
+        setweight(to_tsvector('simple', e.name), 'A')
+        || setweight(to_tsvector('simple', coalesce(v.name, '')), 'B')
+    FROM events_event AS src
+    LEFT JOIN events_venue AS v ON v.id = src.venue_id
+    WHERE src.id = e.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+    UPDATE events_venue AS v
+    SET total_events_count = s.total,
+        upcoming_events_count = s.upcoming,
+        open_events_count = s.open_upcoming,
+        next_event_time = s.next_time
+    FROM (
+        SELECT
+            venue.id,
+            count(e.id) AS total,
+            count(e.id) FILTER (WHERE e.event_time >= now()) AS upcoming,
+            count(e.id) FILTER (
+                WHERE e.event_time >= now() AND e.status = 'open'
+            ) AS open_upcoming,
+            min(e.event_time) FILTER (WHERE e.event_time >= now()) AS next_time
+        FROM events_venue AS venue
+        LEFT JOIN events_event AS e ON e.venue_id = venue.id
+        GROUP BY venue.id
+    ) AS s
+    WHERE v.id = s.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='total_events_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='upcoming_events_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='open_events_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='next_event_time',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,34 @@
+import django.utils.timezone
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('events', '0003_venue_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.CreateModel(
+            name='EventTombstone',
+            fields=[
+                ('event_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at', 'event_id'], name='tombstone_deleted_at_id_idx')],
+            },
+        ),
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['updated_at', 'id'], name='event_updated_at_id_idx'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 import enum
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 
 
 class StatusEnum(enum.StrEnum):  
@@ -12,6 +15,14 @@ class StatusEnum(enum.StrEnum):
 class Venue(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
+    total_events_count = models.PositiveIntegerField(default=0, editable=False)
+    upcoming_events_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    open_events_count = models.PositiveIntegerField(default=0, editable=False)
+    next_event_time = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )
 
     def __str__(self):
         return self.name
@@ -32,6 +43,37 @@ class Event(models.Model):
         on_delete=models.SET_NULL,
         related_name="events",
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="event_search_vector_gin"),
+            models.Index(
+                fields=["updated_at", "id"], name="event_updated_at_id_idx"
+            ),
+            models.Index(fields=["event_time"], name="event_event_time_idx"),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class EventTombstone(models.Model):
+    """
+    Отметка об удалении события для ленты изменений.
+    """
+
+    event_id = models.UUIDField(primary_key=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "event_id"],
+                name="tombstone_deleted_at_id_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} deleted at {self.deleted_at}"
@@ -0,0 +1,222 @@
+import asyncio
+import json
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+GENERATION_KEY = "events:generation"
+
+
+def _stream_id_key(stream_id: str) -> tuple[int, int]:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def event_payload(event, venue=None) -> dict:
+    """
+    Представляет событие в уведомлении так же, как EventSerializer.
+
+    :param event: Событие.
+    :param venue: Площадка события, если уже загружена.
+    :return: Словарь полей события.
+    """
+    return {
+        "id": event.id,
+        "name": event.name,
+        "event_time": event.event_time,
+        "status": event.status,
+        "venue": event.venue_id,
+        "venue_name": venue.name if venue else None,
+    }
+
+
+def _publish(created, updated, deleted):
+    config = settings.EVENTS_STREAM
+    batch_size = config["BATCH_SIZE"]
+    client = redis.Redis.from_url(config["REDIS_URL"])
+    try:
+        items = (
+            [("created", item) for item in created]
+            + [("updated", item) for item in updated]
+            + [("deleted", {"id": item}) for item in deleted]
+        )
+        for i in range(0, len(items), batch_size):
+            message = {"created": [], "updated": [], "deleted": []}
+            for kind, item in items[i : i + batch_size]:
+                message[kind].append(item)
+            data = json.dumps(message, cls=DjangoJSONEncoder)
+            stream_id = client.xadd(
+                config["LOG_KEY"],
+                {"data": data},
+                maxlen=config["LOG_MAXLEN"],
+                approximate=True,
+            )
+            client.publish(
+                config["CHANNEL"],
+                json.dumps({"id": stream_id.decode(), "data": data}),
+            )
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish event changes: {e}")
+    finally:
+        client.close()
+
+
+def publish_changes(created=(), updated=(), deleted=(), using=None):
+    """
+    Публикует пакеты изменений событий в журнал Redis Stream и канал
+    pub/sub после фиксации текущей транзакции. Ошибка публикации
+    записывается в журнал и не влияет на вызывающий код.
+
+    :param created: Словари созданных событий (event_payload).
+    :param updated: Словари измененных событий (event_payload).
+    :param deleted: Идентификаторы удаленных событий.
+    :param using: Алиас базы данных транзакции.
+    """
+    if not (created or updated or deleted):
+        return
+    created, updated, deleted = list(created), list(updated), list(deleted)
+    transaction.on_commit(
+        lambda: _publish(created, updated, deleted), using=using, robust=True
+    )
+
+
+def _bump_generation():
+    client = redis.Redis.from_url(settings.EVENTS_STREAM["REDIS_URL"])
+    try:
+        client.incr(GENERATION_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to bump events generation: {e}")
+    finally:
+        client.close()
+
+
+def bump_generation(using=None):
+    """
+    Увеличивает поколение данных событий после фиксации транзакции,
+    чтобы веб-процессы перестроили свои снимки (events.snapshot).
+
+    :param using: Алиас базы данных транзакции.
+    """
+    transaction.on_commit(_bump_generation, using=using, robust=True)
+
+
+class ChangeBroadcaster:
+    """
+    Одна подписка Redis pub/sub на процесс, раздающая сообщения
+    подключенным SSE-клиентам через их очереди.
+    """
+
+    def __init__(self):
+        self.queues = set()
+        self._task = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.EVENTS_STREAM["QUEUE_SIZE"])
+        self.queues.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.queues.discard(queue)
+
+    async def _listen(self):
+        config = settings.EVENTS_STREAM
+        while True:
+            client = aioredis.Redis.from_url(config["REDIS_URL"])
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(config["CHANNEL"])
+                async for raw in pubsub.listen():
+                    try:
+                        message = json.loads(raw["data"])
+                    except ValueError as e:
+                        logger.warning(f"Skipping malformed change: {e}")
+                        continue
+                    for queue in list(self.queues):
+                        try:
+                            queue.put_nowait(message)
+                        except asyncio.QueueFull:
+                            # Медленный клиент: закрываем поток, клиент
+                            # переподключится и догонит по Last-Event-ID.
+                            self.queues.discard(queue)
+            except aioredis.RedisError as e:
+                logger.warning(f"Change subscription lost: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+broadcaster = ChangeBroadcaster()
+
+
+async def replay_since(last_event_id: str) -> list[dict]:
+    """
+    Возвращает сообщения из журнала после last_event_id.
+
+    :param last_event_id: Значение заголовка Last-Event-ID.
+    :return: Список сообщений {"id", "data"}.
+    """
+    config = settings.EVENTS_STREAM
+    client = aioredis.Redis.from_url(config["REDIS_URL"])
+    try:
+        entries = await client.xrange(
+            config["LOG_KEY"],
+            min=f"({last_event_id}",
+            max="+",
+            count=config["LOG_MAXLEN"],
+        )
+    finally:
+        await client.aclose()
+    return [
+        {"id": entry_id.decode(), "data": fields[b"data"].decode()}
+        for entry_id, fields in entries
+    ]
+
+
+async def change_stream(last_event_id: str | None):
+    """
+    Асинхронный генератор SSE-кадров: сначала пропущенные сообщения из
+    журнала, затем живые уведомления и периодические heartbeat-комментарии.
+
+    :param last_event_id: Последний полученный клиентом id или None.
+    """
+    config = settings.EVENTS_STREAM
+    queue = broadcaster.subscribe()
+    try:
+        last_key = None
+        if last_event_id:
+            try:
+                last_key = _stream_id_key(last_event_id)
+                replayed = await replay_since(last_event_id)
+            except (ValueError, aioredis.RedisError) as e:
+                logger.warning(f"Replay from {last_event_id} failed: {e}")
+                replayed = []
+            for message in replayed:
+                last_key = _stream_id_key(message["id"])
+                yield f"id: {message['id']}\ndata: {message['data']}\n\n"
+
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        while queue in broadcaster.queues or not queue.empty():
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=config["HEARTBEAT"]
+                )
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            key = _stream_id_key(message["id"])
+            if last_key is not None and key <= last_key:
+                continue
+            last_key = key
+            yield f"id: {message['id']}\ndata: {message['data']}\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
@@ -0,0 +1,61 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+
+SEARCH_CONFIG = "simple"
+
+UPDATE_SEARCH_VECTOR_SQL = f"""
+    UPDATE events_event AS e
+    SET search_vector =
+        setweight(to_tsvector('{SEARCH_CONFIG}', e.name), 'A')
+        || setweight(
+            to_tsvector(
+                '{SEARCH_CONFIG}',
+                coalesce(
+                    (SELECT v.name FROM events_venue AS v WHERE v.id = e.venue_id),
+                    ''
+                )
+            ),
+            'B'
+        )
+"""
+
+
+def update_search_vectors(event_ids=None, batch_size: int = 5000) -> int:
+    """
+    Пересчитывает поисковый вектор (название события и площадки) одним
+    UPDATE на пакет идентификаторов.
+
+    :param event_ids: Идентификаторы событий; None — все события.
+    :param batch_size: Размер пакета идентификаторов.
+    :return: Количество обновленных строк.
+    """
+    updated = 0
+    with connection.cursor() as cursor:
+        if event_ids is None:
+            cursor.execute(UPDATE_SEARCH_VECTOR_SQL)
+            return cursor.rowcount
+        event_ids = [str(event_id) for event_id in event_ids]
+        for i in range(0, len(event_ids), batch_size):
+            cursor.execute(
+                UPDATE_SEARCH_VECTOR_SQL + " WHERE e.id = ANY(%s::uuid[])",
+                [event_ids[i : i + batch_size]],
+            )
+            updated += cursor.rowcount
+    return updated
+
+
+def build_search_query(terms: list[str]) -> SearchQuery | None:
+    """
+    Собирает tsquery, в котором каждое слово ищется по префиксу,
+    а все слова должны присутствовать.
+
+    :param terms: Поисковые термы из параметра ?search=.
+    :return: SearchQuery или None, если значимых слов нет.
+    """
+    words = [word for term in terms for word in re.findall(r"\w+", term)]
+    if not words:
+        return None
+    raw = " & ".join(f"{word}:*" for word in words)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
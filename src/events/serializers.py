@@ -1,11 +1,42 @@
 from rest_framework import serializers
 
-from .models import Event
+from common.serializers import TimedListSerializer, TimedModelSerializer
 
+from .models import Event, EventTombstone, Venue
 
-class EventSerializer(serializers.ModelSerializer):
+
+class EventSerializer(TimedModelSerializer):
     venue_name = serializers.CharField(source="venue.name", read_only=True)
 
     class Meta:
         model = Event
         fields = ["id", "name", "event_time", "status", "venue", "venue_name"]
+        list_serializer_class = TimedListSerializer
+
+
+class EventChangeSerializer(EventSerializer):
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ["updated_at"]
+
+
+class EventTombstoneSerializer(TimedModelSerializer):
+    id = serializers.UUIDField(source="event_id")
+
+    class Meta:
+        model = EventTombstone
+        fields = ["id", "deleted_at"]
+        list_serializer_class = TimedListSerializer
+
+
+class VenueSerializer(TimedModelSerializer):
+    class Meta:
+        model = Venue
+        fields = [
+            "id",
+            "name",
+            "total_events_count",
+            "upcoming_events_count",
+            "open_events_count",
+            "next_event_time",
+        ]
+        list_serializer_class = TimedListSerializer
@@ -0,0 +1,218 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+import redis
+from django import forms
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from rest_framework import serializers
+
+from common.logger import get_logger
+
+from .models import Event, StatusEnum
+from .realtime import GENERATION_KEY
+
+logger = get_logger(__name__)
+
+SNAPSHOT_PARAMS = {"status", "event_time__gte", "event_time__lte", "ordering", "page"}
+
+_datetime_field = serializers.DateTimeField()
+
+
+class EventRecord:
+    """
+    Компактная запись события в снимке.
+    """
+
+    __slots__ = ("id", "name", "event_time", "venue_id", "venue_name")
+
+    def __init__(self, id, name, event_time, venue_id, venue_name):
+        self.id = id
+        self.name = name
+        self.event_time = event_time
+        self.venue_id = venue_id
+        self.venue_name = venue_name
+
+    def to_representation(self) -> dict:
+        """
+        Представляет запись так же, как EventSerializer.
+        """
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "event_time": _datetime_field.to_representation(self.event_time),
+            "status": StatusEnum.OPEN.value,
+            "venue": self.venue_id,
+            "venue_name": self.venue_name,
+        }
+
+
+class Snapshot:
+    """
+    Отсортированные по времени открытые события в окне
+    [built_at, covered_until] с массивом отметок времени для bisect.
+    """
+
+    __slots__ = ("generation", "built_at", "covered_until", "times", "records")
+
+    def __init__(self, generation, built_at, covered_until, times, records):
+        self.generation = generation
+        self.built_at = built_at
+        self.covered_until = covered_until
+        self.times = times
+        self.records = records
+
+    @classmethod
+    def build(cls, generation, horizon_days: int) -> "Snapshot":
+        """
+        Загружает предстоящие открытые события одним запросом из основной
+        базы: снимок строится по сигналу о новом поколении, и отстающая
+        реплика отдала бы данные предыдущего.
+
+        :param generation: Поколение данных, для которого строится снимок.
+        :param horizon_days: Глубина окна в днях.
+        :return: Новый снимок.
+        """
+        built_at = timezone.now()
+        covered_until = built_at + timezone.timedelta(days=horizon_days)
+        rows = (
+            Event.objects.using(DEFAULT_DB_ALIAS)
+            .filter(
+                status=StatusEnum.OPEN.value,
+                event_time__gte=built_at,
+                event_time__lte=covered_until,
+            )
+            .order_by("event_time", "id")
+            .values_list("id", "name", "event_time", "venue_id", "venue__name")
+            .iterator(chunk_size=10000)
+        )
+        times = array("d")
+        records = []
+        venue_names = {}
+        for event_id, name, event_time, venue_id, venue_name in rows:
+            times.append(event_time.timestamp())
+            if venue_id is not None:
+                venue_id = str(venue_id)
+                # Одна строка названия на площадку, а не на событие.
+                venue_name = venue_names.setdefault(venue_id, venue_name)
+            records.append(
+                EventRecord(event_id, name, event_time, venue_id, venue_name)
+            )
+        return cls(generation, built_at, covered_until, times, records)
+
+    def covers(self, start, end) -> bool:
+        return self.built_at <= start and end <= self.covered_until
+
+    def between(self, start, end) -> list[EventRecord]:
+        """
+        Возвращает записи с event_time в [start, end].
+        """
+        lo = bisect_left(self.times, start.timestamp())
+        hi = bisect_right(self.times, end.timestamp())
+        return self.records[lo:hi]
+
+
+class SnapshotHolder:
+    """
+    Держит текущий снимок процесса и атомарно подменяет его, когда меняется
+    поколение данных (после sync_events/cleanup_old_events) или снимок устарел.
+    """
+
+    def __init__(self):
+        self.snapshot = None
+        self._checked_at = 0.0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def _current_generation(self):
+        config = settings.EVENTS_SNAPSHOT
+        now = time.monotonic()
+        if now - self._checked_at < config["CHECK_INTERVAL"]:
+            return self._generation
+        client = redis.Redis.from_url(settings.EVENTS_STREAM["REDIS_URL"])
+        try:
+            value = client.get(GENERATION_KEY)
+        finally:
+            client.close()
+        self._generation = int(value or 0)
+        self._checked_at = now
+        return self._generation
+
+    def get(self) -> Snapshot | None:
+        """
+        Возвращает актуальный снимок, при необходимости перестраивая его.
+
+        :return: Снимок или None, если поколение узнать не удалось.
+        """
+        config = settings.EVENTS_SNAPSHOT
+        try:
+            generation = self._current_generation()
+        except redis.RedisError as e:
+            logger.warning(f"Snapshot generation unavailable: {e}")
+            return None
+
+        snapshot = self.snapshot
+        max_age = timezone.timedelta(seconds=config["MAX_AGE"])
+        if (
+            snapshot is not None
+            and snapshot.generation == generation
+            and timezone.now() - snapshot.built_at < max_age
+        ):
+            return snapshot
+
+        with self._lock:
+            snapshot = self.snapshot
+            if (
+                snapshot is None
+                or snapshot.generation != generation
+                or timezone.now() - snapshot.built_at >= max_age
+            ):
+                snapshot = Snapshot.build(generation, config["HORIZON_DAYS"])
+                self.snapshot = snapshot
+                logger.info(
+                    f"Events snapshot rebuilt: generation {generation}, "
+                    f"{len(snapshot.records)} events"
+                )
+        return snapshot
+
+
+holder = SnapshotHolder()
+
+
+def snapshot_response(view, request):
+    """
+    Отвечает на запрос списка событий из снимка, если запрос целиком
+    укладывается в него: status=open, сортировка по event_time и диапазон
+    event_time__gte/event_time__lte внутри окна снимка.
+
+    :param view: Экземпляр EventListView.
+    :param request: DRF-запрос.
+    :return: Response или None, если запрос нужно выполнить в базе.
+    """
+    if not settings.EVENTS_SNAPSHOT["ENABLED"]:
+        return None
+    params = request.query_params
+    if not set(params) <= SNAPSHOT_PARAMS:
+        return None
+    if params.get("status") != StatusEnum.OPEN.value:
+        return None
+    if params.get("ordering") not in (None, "", "event_time"):
+        return None
+    try:
+        field = forms.DateTimeField()
+        start = field.clean(params.get("event_time__gte"))
+        end = field.clean(params.get("event_time__lte"))
+    except forms.ValidationError:
+        return None
+
+    snapshot = holder.get()
+    if snapshot is None or not snapshot.covers(start, end):
+        return None
+
+    page = view.paginate_queryset(snapshot.between(start, end))
+    return view.get_paginated_response(
+        [record.to_representation() for record in page]
+    )
@@ -1,15 +1,15 @@
 from celery import shared_task
-from django.utils import timezone
 from django.conf import settings
 
-from .models import Event
+from .cleanup import delete_old_events
+from .venue_stats import refresh_stale_venue_stats
 
 
 @shared_task
 def cleanup_old_events():
-    cutoff = timezone.now() - timezone.timedelta(
-        days=settings.EVENT_CLEANUP_DAYS
-    )
-    old_events = Event.objects.filter(event_time__lt=cutoff)
-    deleted_count, _ = old_events.delete()
-    return deleted_count
+    return delete_old_events(settings.EVENT_CLEANUP_DAYS)
+
+
+@shared_task
+def refresh_venue_stats():
+    return refresh_stale_venue_stats()
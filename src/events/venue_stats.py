@@ -0,0 +1,67 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .models import Venue
+
+REFRESH_VENUE_STATS_SQL = """
+    UPDATE events_venue AS v
+    SET total_events_count = s.total,
+        upcoming_events_count = s.upcoming,
+        open_events_count = s.open_upcoming,
+        next_event_time = s.next_time
+    FROM (
+        SELECT
+            venue.id,
+            count(e.id) AS total,
+            count(e.id) FILTER (WHERE e.event_time >= now()) AS upcoming,
+            count(e.id) FILTER (
+                WHERE e.event_time >= now() AND e.status = 'open'
+            ) AS open_upcoming,
+            min(e.event_time) FILTER (WHERE e.event_time >= now()) AS next_time
+        FROM events_venue AS venue
+        LEFT JOIN events_event AS e ON e.venue_id = venue.id
+        {where}
+        GROUP BY venue.id
+    ) AS s
+    WHERE v.id = s.id
+"""
+
+
+def refresh_venue_stats(
+    venue_ids=None, batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS
+) -> int:
+    """
+    Пересчитывает счетчики площадок (всего, предстоящих, открытых предстоящих
+    событий и время ближайшего события) одним UPDATE на пакет площадок.
+
+    :param venue_ids: Идентификаторы площадок; None — все площадки.
+    :param batch_size: Размер пакета идентификаторов.
+    :param using: Алиас базы данных.
+    :return: Количество обновленных площадок.
+    """
+    updated = 0
+    with connections[using].cursor() as cursor:
+        if venue_ids is None:
+            cursor.execute(REFRESH_VENUE_STATS_SQL.format(where=""))
+            return cursor.rowcount
+        venue_ids = [str(venue_id) for venue_id in venue_ids if venue_id]
+        sql = REFRESH_VENUE_STATS_SQL.format(
+            where="WHERE venue.id = ANY(%s::uuid[])"
+        )
+        for i in range(0, len(venue_ids), batch_size):
+            cursor.execute(sql, [venue_ids[i : i + batch_size]])
+            updated += cursor.rowcount
+    return updated
+
+
+def refresh_stale_venue_stats() -> int:
+    """
+    Пересчитывает площадки, чье ближайшее событие уже прошло: со временем
+    события перестают быть предстоящими без какой-либо записи в таблицу.
+
+    :return: Количество обновленных площадок.
+    """
+    stale_ids = Venue.objects.filter(
+        next_event_time__lt=timezone.now()
+    ).values_list("id", flat=True)
+    return refresh_venue_stats(list(stale_ids))
@@ -1,10 +1,28 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
-from .models import Event
-from .serializers import EventSerializer
+from .changes import ExpiredCursor, InvalidCursor, get_changes
+from .filters import FullTextSearchFilter
+from .models import Event, Venue
+from .realtime import change_stream
+from .serializers import (
+    EventChangeSerializer,
+    EventSerializer,
+    EventTombstoneSerializer,
+    VenueSerializer,
+)
+from .snapshot import snapshot_response
 
 
 class EventListView(generics.ListAPIView):
@@ -14,13 +32,152 @@ class EventListView(generics.ListAPIView):
 
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ["status", "event_time", "venue__id", "venue__name"]
+    filter_backends = [
+        DjangoFilterBackend,
+        OrderingFilter,
+        FullTextSearchFilter,
+    ]
+    filterset_fields = {
+        "status": ["exact"],
+        "event_time": ["exact", "gte", "lte"],
+        "venue__id": ["exact"],
+        "venue__name": ["exact"],
+    }
     search_fields = ["name", "venue__name"]
     ordering_fields = ["event_time"]
     ordering = ["event_time"]
 
     def get_queryset(self):
-        return Event.objects.select_related("venue").prefetch_related(
-            "venue__events"
+        return Event.objects.select_related("venue")
+
+    def list(self, request, *args, **kwargs):
+        response = snapshot_response(self, request)
+        if response is not None:
+            return response
+        return super().list(request, *args, **kwargs)
+
+
+class EventChangesView(APIView):
+    """
+    Лента изменений событий после курсора ?changed_since=.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        changed_since = request.query_params.get("changed_since")
+        if not changed_since:
+            return Response(
+                {"error": "changed_since is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        config = settings.CHANGES_FEED
+        try:
+            limit = int(request.query_params.get("limit", config["PAGE_SIZE"]))
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, config["MAX_PAGE_SIZE"]))
+
+        try:
+            changes = get_changes(changed_since, limit)
+        except InvalidCursor:
+            return Response(
+                {"error": "Invalid changed_since cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ExpiredCursor:
+            return Response(
+                {"error": "Cursor expired, full resync required"},
+                status=status.HTTP_410_GONE,
+            )
+
+        return Response(
+            {
+                "upserts": EventChangeSerializer(
+                    changes["upserts"], many=True
+                ).data,
+                "deletes": EventTombstoneSerializer(
+                    changes["deletes"], many=True
+                ).data,
+                "next_cursor": changes["next_cursor"],
+                "has_more": changes["has_more"],
+            }
         )
+
+
+def _authenticate_stream(request):
+    """
+    Аутентифицирует SSE-запрос по заголовку Authorization или параметру
+    ?access_token= (EventSource в браузере не умеет передавать заголовки).
+    """
+    auth = JWTAuthentication()
+    try:
+        result = auth.authenticate(request)
+        if result is not None:
+            return result[0]
+        raw_token = request.GET.get("access_token")
+        if raw_token:
+            return auth.get_user(auth.get_validated_token(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        # AuthenticationFailed: пользователь удален или неактивен,
+        # заголовок Authorization некорректен.
+        return None
+    return None
+
+
+async def event_stream_view(request):
+    """
+    Поток Server-Sent Events с изменениями событий после каждой синхронизации.
+
+    Обслуживается только ASGI-приложением (сервис stream): под WSGI
+    бесконечный поток занял бы рабочий процесс на все время подключения.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "Event stream is served by the ASGI application"},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    user = await sync_to_async(_authenticate_stream)(request)
+    if user is None:
+        return JsonResponse(
+            {"error": "Authentication required"},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    response = StreamingHttpResponse(
+        change_stream(last_event_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class VenueListView(generics.ListAPIView):
+    """
+    Список площадок с предрассчитанными счетчиками событий.
+    """
+
+    serializer_class = VenueSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = {
+        "name": ["exact"],
+        "upcoming_events_count": ["exact", "gte"],
+        "open_events_count": ["exact", "gte"],
+        "next_event_time": ["gte", "lte"],
+    }
+    search_fields = ["name"]
+    ordering_fields = [
+        "name",
+        "next_event_time",
+        "upcoming_events_count",
+        "open_events_count",
+        "total_events_count",
+    ]
+    ordering = ["name"]
+    queryset = Venue.objects.all()
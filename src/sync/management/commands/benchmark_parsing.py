@@ -0,0 +1,125 @@
+import json
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+import ijson
+from django.core.management.base import BaseCommand
+
+from sync.parsing import PageInfo, iter_events
+
+
+def _write_payload(file, count: int):
+    """
+    Пишет в файл синтетический ответ поставщика из count событий.
+    """
+    started = datetime(2025, 1, 1, 12, 0)
+    venues = [
+        {"id": str(uuid.uuid4()), "name": f"Venue {i}"} for i in range(100)
+    ]
+    file.write(b"[")
+    for i in range(count):
+        event = {
+            "id": str(uuid.uuid4()),
+            "name": f"Event {i}",
+            "event_time": (started + timedelta(minutes=i)).isoformat() + "Z",
+            "status": "open" if i % 3 else "closed",
+            "venue": venues[i % len(venues)],
+        }
+        if i:
+            file.write(b",")
+        file.write(json.dumps(event).encode())
+    file.write(b"]")
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает потоковый разбор ответа поставщика (ijson) с response.json()
+    по скорости и пиковой памяти.
+    """
+
+    help = "Benchmark streaming JSON parsing of provider responses"
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=100_000,
+            help="Number of synthetic events in the payload (default: 100000)",
+        )
+        parser.add_argument(
+            "--file",
+            type=str,
+            default=None,
+            help="Use a saved provider response instead of a synthetic one",
+        )
+
+    def _measure(self, label: str, parse, size: int):
+        # Время и память меряются отдельными прогонами: tracemalloc
+        # замедляет разбор в разы.
+        started = time.perf_counter()
+        count = parse()
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        parse()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"{label:<14} {count:>9} events  {elapsed:7.2f} s  "
+            f"{size / 1024 / 1024 / elapsed:7.1f} MiB/s  "
+            f"{count / elapsed:9.0f} events/s  "
+            f"peak {peak / 1024 / 1024:7.1f} MiB"
+        )
+        return elapsed, peak
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".json") as tmp:
+            path = options["file"]
+            if path is None:
+                _write_payload(tmp, options["events"])
+                tmp.flush()
+                path = tmp.name
+            with open(path, "rb") as file:
+                size = file.seek(0, 2)
+            self.stdout.write(
+                f"Payload: {size / 1024 / 1024:.1f} MiB, "
+                f"ijson backend: {ijson.backend}"
+            )
+
+            def parse_json():
+                # Так работает response.json(): тело целиком, затем дерево.
+                with open(path, "rb") as file:
+                    data = json.loads(file.read())
+                if isinstance(data, dict):
+                    data = data.get("results") or []
+                return len(data)
+
+            def parse_stream():
+                count = 0
+                with open(path, "rb") as file:
+                    for _ in iter_events(file, PageInfo()):
+                        count += 1
+                return count
+
+            json_time, json_peak = self._measure("response.json", parse_json, size)
+            stream_time, stream_peak = self._measure("ijson", parse_stream, size)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Streaming: {json_time / stream_time:.2f}x throughput, "
+                f"{json_peak / max(stream_peak, 1):.0f}x less peak memory"
+            )
+        )
@@ -0,0 +1,178 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_SCRIPT = """
+import importlib
+import django
+django.setup()
+from django.core.management import call_command, load_command_class
+load_command_class({app!r}, {command!r})
+if {argv!r} is not None:
+    call_command({command!r}, *{argv!r})
+for module in {imports!r}:
+    importlib.import_module(module)
+"""
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """
+    Заглушка поставщика: на любой запрос отдает пустой список событий.
+    """
+
+    def do_GET(self):
+        body = json.dumps([]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """
+    Разбирает вывод python -X importtime.
+
+    :param output: stderr дочернего процесса.
+    :return: Список (модуль, собственное время, накопленное время) в мкс.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split(
+            "|", 2
+        )
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    """
+    Проверяет, что холодный старт management-команд укладывается в бюджет
+    времени импорта (python -X importtime).
+    """
+
+    help = "Fail when cold-start import time of CLI commands exceeds budgets"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        """
+        Добавляет аргументы командной строки.
+
+        :param parser: Экземпляр ArgumentParser, к которому добавляются аргументы.
+        """
+        parser.add_argument(
+            "--settings-module",
+            type=str,
+            default="core.settings_cli",
+            help="Settings module used for the measured process",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Number of cold starts per command, best run is used",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Show the N slowest imports by cumulative time",
+        )
+
+    def _measure(
+        self, command: str, config: dict, settings_module: str, stub_url: str
+    ):
+        """
+        Запускает чистый интерпретатор, выполняет в нем команду против
+        заглушки поставщика и замеряет все импорты, включая ленивые.
+
+        :return: Суммарное время импорта в мс и строки importtime.
+        """
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings_module,
+            "EVENTS_FACE_BASE_URL": stub_url,
+        }
+        src_dir = str(settings.BASE_DIR)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [src_dir, env.get("PYTHONPATH")])
+        )
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                IMPORT_SCRIPT.format(
+                    app=config["APP"],
+                    command=command,
+                    argv=config["ARGV"],
+                    imports=config["IMPORTS"],
+                ),
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0:
+            tail = "\n".join(
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            )
+            raise CommandError(f"Failed to run {command}:\n{tail}")
+        total_ms = sum(self_us for _, self_us, _ in rows) / 1000
+        return total_ms, rows
+
+    def handle(self, *args, **options):
+        """
+        Точка входа для выполнения команды.
+
+        param: Позиционные аргументы.
+        param: Ключевые аргументы команды.
+        """
+        stub = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        stub_url = f"http://127.0.0.1:{stub.server_port}/api/events/"
+        violations = []
+        try:
+            for command, config in settings.STARTUP_BUDGETS_MS.items():
+                best = None
+                for _ in range(max(1, options["runs"])):
+                    measured = self._measure(
+                        command, config, options["settings_module"], stub_url
+                    )
+                    if best is None or measured[0] < best[0]:
+                        best = measured
+                budget = config["BUDGET"]
+                total_ms, rows = best
+
+                style = self.style.SUCCESS if total_ms <= budget else self.style.ERROR
+                self.stdout.write(
+                    style(f"{command}: {total_ms:.1f} ms (budget {budget} ms)")
+                )
+                slowest = sorted(rows, key=lambda row: row[2], reverse=True)
+                for module, _, cumulative_us in slowest[: options["top"]]:
+                    self.stdout.write(f"  {cumulative_us / 1000:>8.1f} ms  {module}")
+                if total_ms > budget:
+                    violations.append(command)
+        finally:
+            stub.shutdown()
+            stub.server_close()
+
+        if violations:
+            raise CommandError(
+                f"Import time budget exceeded: {', '.join(violations)}"
+            )
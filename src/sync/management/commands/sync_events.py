@@ -1,16 +1,39 @@
+import hashlib
+import tempfile
 import time
-from datetime import datetime, timedelta
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
 import uuid
 
-import requests
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.conf import settings
 
+from common.metrics import (
+    SYNC_EVENTS,
+    SYNC_HTTP_RETRIES,
+    SYNC_PAGES_FETCHED,
+    SYNC_PHASE_DURATION,
+)
+from common.logger import get_logger
+from core.db_router import pin_to_primary, reset_pinning
 from events.models import Event, Venue
-from src.common import logger
 from sync.models import SyncResult
+from sync.page_cache import FETCHED, NOT_MODIFIED, UNCHANGED, PageCache
+from sync.parsing import (
+    BUFFER_SIZE,
+    JSONError,
+    PageInfo,
+    UnexpectedFormat,
+    iter_events,
+)
+
+logger = get_logger(__name__)
 
 BASE_URL = settings.EVENTS_FACE.get(
     "BASE_URL", "https://events.k3scluster.tech/api/events/"
@@ -18,6 +41,9 @@ BASE_URL = settings.EVENTS_FACE.get(
 MAX_RETRIES = settings.EVENTS_FACE.get("MAX_RETRIES", 3)
 DEFAULT_BATCH_SIZE = settings.EVENTS_FACE.get("DEFAULT_BATCH_SIZE", 500)
 DEFAULT_TIMEOUT = settings.EVENTS_FACE.get("DEFAULT_TIMEOUT", 10)
+DEFAULT_WORKERS = settings.EVENTS_FACE.get("BACKFILL_WORKERS", 4)
+# Тело страницы до этого размера буферизуется в памяти, больше — на диске.
+SPOOL_SIZE = 8 * 1024 * 1024
 
 
 def perform_request_with_retries(
@@ -25,6 +51,8 @@ def perform_request_with_retries(
     timeout: int = DEFAULT_TIMEOUT,
     max_retries: int = MAX_RETRIES,
     backoff: int = 2,
+    stream: bool = False,
+    headers: dict | None = None,
 ):
     """
     Выполняет GET-запрос с повторными попытками при сетевых ошибках и ошибках HTTP.
@@ -33,11 +61,25 @@ def perform_request_with_retries(
     :param timeout: Время ожидания ответа.
     :param max_retries: Максимальное количество попыток.
     :param backoff: Время ожидания между попытками.
+    :param stream: Не читать тело ответа сразу (для потокового разбора).
+    :param headers: Дополнительные заголовки (условный запрос).
     :return: Response объект при успешном запросе, None при неудаче.
     """
+    # requests импортируется лениво: он нужен только при реальной загрузке,
+    # а не при --help и проверках команды.
+    import requests
+
     for attempt in range(1, max_retries + 1):
         try:
-            response = requests.get(url, timeout=timeout, verify=True)
+            response = requests.get(
+                url,
+                timeout=timeout,
+                verify=True,
+                stream=stream,
+                headers=headers,
+            )
+            if response.status_code >= 400:
+                response.close()
             if response.status_code == 404:
                 logger.warning(f"Resource not found (404) at {url}")
                 return None
@@ -47,6 +89,7 @@ def perform_request_with_retries(
                 )
                 if attempt < max_retries:
                     logger.warning(f"Retrying in {backoff} seconds...")
+                    SYNC_HTTP_RETRIES.inc()
                     time.sleep(backoff)
                 else:
                     return None
@@ -66,6 +109,7 @@ def perform_request_with_retries(
                 logger.warning(
                     f"Attempt {attempt} failed: {e}. Retrying in {backoff} seconds..."
                 )
+                SYNC_HTTP_RETRIES.inc()
                 time.sleep(backoff)
             else:
                 logger.error(
@@ -74,12 +118,68 @@ def perform_request_with_retries(
                 return None
 
 
+def _event_key(ev) -> str | None:
+    """
+    Возвращает нормализованный идентификатор события для дедупликации.
+    """
+    if not isinstance(ev, dict):
+        return None
+    try:
+        return str(uuid.UUID(str(ev.get("id"))))
+    except (ValueError, TypeError):
+        return None
+
+
+def _event_version(ev):
+    for field in ("changed_at", "updated_at"):
+        value = ev.get(field)
+        if isinstance(value, str):
+            parsed = parse_datetime(value)
+            if parsed is not None:
+                return parsed
+    return None
+
+
+def merge_day_events(days_events: list[tuple[date, list]]):
+    """
+    Объединяет изменения за несколько дней, оставляя для каждого события
+    самую свежую версию: по полю changed_at/updated_at, если оно есть,
+    иначе по более позднему дню.
+
+    :param days_events: Пары (день, список событий за день).
+    :return: Список событий и словарь {id события: день его версии}.
+    """
+    merged = {}
+    invalid = []
+    event_days = {}
+    for day, events in sorted(days_events, key=lambda item: item[0]):
+        for ev in events:
+            key = _event_key(ev)
+            if key is None:
+                invalid.append(ev)
+                continue
+            current = merged.get(key)
+            if current is not None:
+                current_version = _event_version(current)
+                new_version = _event_version(ev)
+                if (
+                    current_version is not None
+                    and new_version is not None
+                    and new_version < current_version
+                ):
+                    continue
+            merged[key] = ev
+            event_days[key] = day
+    return list(merged.values()) + invalid, event_days
+
+
 class Command(BaseCommand):
     """
     Класс команд управления Django для синхронизации событий с внешним поставщиком событий.
     """
 
     help = "Synchronize events with the events-provider"
+    requires_system_checks = []
 
     def add_arguments(self, parser):
         """
@@ -92,6 +192,24 @@ class Command(BaseCommand):
             type=str,
             help="Date for synchronization in YYYY-MM-DD format",
         )
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            type=str,
+            help="Start of the backfill range in YYYY-MM-DD format",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            type=str,
+            help="End of the backfill range (inclusive), defaults to yesterday",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="Parallel day fetches for --from/--to (default: 4)",
+        )
         parser.add_argument(
             "--all", action="store_true", help="Synchronize all events"
         )
@@ -118,6 +236,11 @@ class Command(BaseCommand):
             default=DEFAULT_TIMEOUT,
             help="Timeout for HTTP requests in seconds",
         )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Ignore the provider page cache and process every page",
+        )
         parser.add_argument(
             "--max-retries",
             type=int,
@@ -131,6 +254,8 @@ class Command(BaseCommand):
         max_retries: int = MAX_RETRIES,
         backoff: int = 2,
         timeout: int = DEFAULT_TIMEOUT,
+        stream: bool = False,
+        headers: dict | None = None,
     ):
         """
         Достает данные из URL с логикой повторных попыток при сетевых ошибках и ошибках HTTP.
@@ -138,11 +263,18 @@ class Command(BaseCommand):
         param: URL для извлечения данных.
         param: Максимальное количество попыток.
         param: Время ожидания перед повторной попыткой.
+        param: Не читать тело ответа сразу.
+        param: Дополнительные заголовки запроса.
 
         return: Объект Response в случае успеха, None в противном случае.
         """
         return perform_request_with_retries(
-            url=url, timeout=timeout, max_retries=max_retries, backoff=backoff
+            url=url,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff=backoff,
+            stream=stream,
+            headers=headers,
         )
 
     def log_metrics(self, new_events_count: int, updated_events_count: int):
@@ -158,6 +290,194 @@ class Command(BaseCommand):
             )
         )
 
+    def _buffer(self, response):
+        """
+        Читает тело ответа во временный файл, попутно считая его хэш.
+
+        :return: Файл с телом, перемотанный в начало, и sha256 тела.
+        """
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: response.raw.read(BUFFER_SIZE), b""):
+            digest.update(chunk)
+            body.write(chunk)
+        body.seek(0)
+        return body, digest.hexdigest()
+
+    def iter_response(
+        self, response, page_info: PageInfo | None = None, url=None, entry=None
+    ):
+        """
+        Потоково разбирает тело ответа, отдавая события по одному, и
+        закрывает соединение по завершении. С кэшем страниц тело сначала
+        хэшируется, и страница с тем же хэшем пропускается без разбора.
+
+        :param response: Response, полученный с stream=True.
+        :param page_info: Сведения о странице (формат, ссылка на следующую).
+        :param url: URL страницы — ключ кэша.
+        :param entry: Запись кэша для url или None.
+        """
+        import urllib3
+
+        page_info = page_info or PageInfo()
+        response.raw.decode_content = True
+        source = response.raw
+        try:
+            if self.page_cache is None or url is None:
+                yield from iter_events(source, page_info)
+                return
+
+            source, digest = self._buffer(response)
+            result = FETCHED
+            if entry and entry.get("hash") == digest:
+                result = UNCHANGED
+                page_info.shape = entry.get("shape")
+                page_info.next_url = entry.get("next")
+            else:
+                yield from iter_events(source, page_info)
+            self.page_cache.stage(
+                url,
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "hash": digest,
+                    "shape": page_info.shape,
+                    "next": page_info.next_url,
+                },
+                result,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            # Обрыв соединения посреди тела — тот же неполный JSON.
+            raise JSONError(f"Response stream interrupted: {e}") from e
+        finally:
+            if source is not response.raw:
+                source.close()
+            response.close()
+
+    def open_page(self, url: str, page_info: PageInfo):
+        """
+        Запрашивает страницу поставщика, условно, если она есть в кэше.
+
+        :param url: URL страницы.
+        :param page_info: Сведения о странице (формат, ссылка на следующую).
+        :return: Итератор событий (пустой, если страница не изменилась)
+            или None при ошибке загрузки.
+        """
+        entry = self.page_cache.get(url) if self.page_cache else None
+        response = self.fetch_with_retries(
+            url,
+            max_retries=self.max_retries,
+            timeout=self.timeout,
+            stream=True,
+            headers=PageCache.conditional_headers(entry),
+        )
+        if response is None:
+            return None
+        if response.status_code == 304 and entry:
+            response.close()
+            page_info.shape = entry.get("shape")
+            page_info.next_url = entry.get("next")
+            self.page_cache.stage(
+                url,
+                {
+                    "etag": response.headers.get("ETag") or entry.get("etag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                    or entry.get("last_modified"),
+                    "hash": entry.get("hash"),
+                    "shape": page_info.shape,
+                    "next": page_info.next_url,
+                },
+                NOT_MODIFIED,
+            )
+            return iter(())
+        SYNC_PAGES_FETCHED.inc()
+        return self.iter_response(response, page_info, url=url, entry=entry)
+
+    def open_day(self, day: date):
+        """
+        Запрашивает изменения поставщика за один день (?changed_at=).
+
+        :param day: День изменений.
+        :return: Итератор событий или None при ошибке загрузки.
+        """
+        return self.open_page(f"{BASE_URL}?changed_at={day}", PageInfo())
+
+    def fetch_day(self, day: date):
+        """
+        Загружает изменения поставщика за один день целиком.
+
+        :param day: День изменений.
+        :return: Список событий или None при ошибке загрузки или разбора.
+        """
+        events = self.open_day(day)
+        if events is None:
+            return None
+        try:
+            return list(events)
+        except (JSONError, UnexpectedFormat) as e:
+            self.stderr.write(
+                self.style.ERROR(f"Failed to parse JSON response for {day}: {e}")
+            )
+            return None
+
+    def iter_all_pages(self):
+        """
+        Потоково обходит все страницы поставщика по ссылкам next.
+        """
+        url = BASE_URL
+        page_number = 1
+        while url:
+            page_info = PageInfo()
+            events = self.open_page(url, page_info)
+            if events is None:
+                return
+            yield from events
+            logger.info(
+                f"Fetched page {page_number} with {page_info.count} events"
+            )
+            url = page_info.next_url if page_info.shape == "page" else None
+            page_number += 1
+
+    def save_results(
+        self,
+        new_by_day: Counter,
+        updated_by_day: Counter,
+        event_days=None,
+        period=(None, None),
+        days=(),
+    ):
+        """
+        Сохраняет итог синхронизации и, для диапазона дней, итоги по каждому дню.
+
+        :param new_by_day: Количество созданных событий по дням версии.
+        :param updated_by_day: Количество обновленных событий по дням версии.
+        :param event_days: Словарь {id события: день его версии} или None.
+        :param period: Пара (первый день, последний день) или (None, None).
+        :param days: Загруженные дни диапазона.
+        """
+        summary = SyncResult.objects.create(
+            new_events_count=new_by_day.total(),
+            updated_events_count=updated_by_day.total(),
+            period_start=period[0],
+            period_end=period[1],
+        )
+        if event_days is None:
+            return summary
+
+        SyncResult.objects.bulk_create(
+            [
+                SyncResult(
+                    new_events_count=new_by_day[day],
+                    updated_events_count=updated_by_day[day],
+                    period_start=day,
+                    period_end=day,
+                    parent=summary,
+                )
+                for day in sorted(set(days) | set(event_days.values()))
+            ]
+        )
+        return summary
+
     def bulk_process(self, items, model, update_fields=None):
         """
         Выполняет пакетную обработку объектов с использованием bulk_create или bulk_update.
@@ -177,94 +497,88 @@ class Command(BaseCommand):
                         batch, update_fields, batch_size=batch_size
                     )
 
-    def _sync_events(self, events_data):
+    def _validate_event(self, ev):
         """
-        Синхронизирует события и площадки на основе полученных данных.
+        Проверяет и нормализует данные одного события.
 
-        param: Список данных событий
+        :param ev: Данные события от поставщика.
+        :return: Нормализованные данные или None, если событие пропускается.
         """
-        if not isinstance(events_data, list):
-            self.stderr.write(
-                self.style.ERROR(
-                    "Invalid response format: expected a list of events"
-                )
-            )
-            return
-
-        if self.limit is not None:
-            events_data = events_data[: self.limit]
+        if not isinstance(ev, dict):
+            logger.warning("Skipping event due to invalid data structure")
+            return None
 
-        venue_ids = set()
-        event_ids = set()
-        skipped_count = 0
+        ev_id = ev.get("id")
+        try:
+            uuid_obj = uuid.UUID(str(ev_id))
+        except (ValueError, TypeError):
+            logger.warning(f"Skipping event due to invalid UUID id: {ev_id}")
+            return None
+
+        name = ev.get("name")
+        if not isinstance(name, str) or not name.strip():
+            logger.warning(
+                f"Skipping event due to empty or invalid name: {ev_id}"
+            )
+            return None
+        if len(name) > 255:
+            logger.warning(
+                f"Skipping event due to name too long (>255 chars): {ev_id}"
+            )
+            return None
 
-        valid_events = []
-        for ev in events_data:
-            if not isinstance(ev, dict):
-                logger.warning("Skipping event due to invalid data structure")
-                skipped_count += 1
-                continue
+        event_time_raw = ev.get("event_time")
+        event_time = (
+            parse_datetime(event_time_raw)
+            if isinstance(event_time_raw, str)
+            else None
+        )
+        if event_time is None:
+            logger.warning(
+                f"Skipping event due to invalid event_time format: {ev_id}"
+            )
+            return None
 
-            ev_id = ev.get("id")
+        status = ev.get("status", "open")
+        if status not in ("open", "closed"):
+            logger.warning(
+                f"Invalid status '{status}' for event {ev_id}, setting to 'open'"
+            )
+            status = "open"
+        ev["status"] = status
+        ev["id"] = uuid_obj
+
+        venue_data = ev.get("venue")
+        if (
+            venue_data
+            and isinstance(venue_data, dict)
+            and venue_data.get("id") is not None
+        ):
             try:
-                uuid_obj = uuid.UUID(str(ev_id))
+                venue_data["id"] = uuid.UUID(str(venue_data["id"]))
             except (ValueError, TypeError):
                 logger.warning(
-                    f"Skipping event due to invalid UUID id: {ev_id}"
-                )
-                skipped_count += 1
-                continue
-
-            name = ev.get("name")
-            if not isinstance(name, str) or not name.strip():
-                logger.warning(
-                    f"Skipping event due to empty or invalid name: {ev_id}"
+                    f"Invalid venue id for event {ev_id}, dropping venue"
                 )
-                skipped_count += 1
-                continue
-            if len(name) > 255:
-                logger.warning(
-                    f"Skipping event due to name too long (>255 chars): {ev_id}"
-                )
-                skipped_count += 1
-                continue
+                ev["venue"] = None
+        return ev
 
-            event_time_raw = ev.get("event_time")
-            event_time = parse_datetime(event_time_raw)
-            if event_time is None:
-                logger.warning(
-                    f"Skipping event due to invalid event_time format: {ev_id}"
-                )
-                skipped_count += 1
-                continue
-
-            status = ev.get("status", "open")
-            if status not in ("open", "closed"):
-                logger.warning(
-                    f"Invalid status '{status}' for event {ev_id}, setting to 'open'"
-                )
-                status = "open"
-            ev["status"] = status
+    def _sync_chunk(self, valid_events):
+        """
+        Сравнивает пакет проверенных событий с базой и записывает изменения.
 
-            valid_events.append(ev)
-            event_ids.add(ev_id)
+        :param valid_events: Проверенные события с уникальными id.
+        :return: Созданные события, обновленные события и затронутые площадки.
+        """
+        phase_started = time.perf_counter()
+        venue_ids = set()
+        event_ids = set()
+        for ev in valid_events:
+            event_ids.add(ev["id"])
             venue_data = ev.get("venue")
-            if (
-                venue_data
-                and isinstance(venue_data, dict)
-                and venue_data.get("id") is not None
-            ):
+            if isinstance(venue_data, dict) and venue_data.get("id") is not None:
                 venue_ids.add(venue_data["id"])
 
-        self.stdout.write(
-            self.style.NOTICE(f"Total events received: {len(events_data)}")
-        )
-        self.stdout.write(
-            self.style.NOTICE(
-                f"Events skipped due to validation: {skipped_count}"
-            )
-        )
-
         existing_venues = Venue.objects.filter(id__in=venue_ids)
         venue_map = {v.id: v for v in existing_venues}
 
@@ -283,18 +597,15 @@ class Command(BaseCommand):
             ):
                 vid = venue_data["id"]
                 if vid not in venue_map:
-                    new_venues.append(
-                        Venue(id=vid, name=venue_data.get("name", ""))
-                    )
-        if new_venues:
-            if not self.dry_run:
-                self.bulk_process(new_venues, Venue)
-
-            for v in new_venues:
-                venue_map[v.id] = v
+                    venue = Venue(id=vid, name=venue_data.get("name", ""))
+                    new_venues.append(venue)
+                    venue_map[vid] = venue
+        if new_venues and not self.dry_run:
+            self.bulk_process(new_venues, Venue)
 
         new_events = []
         events_to_update = []
+        affected_venue_ids = set()
         fields_to_check = ["name", "event_time", "status", "venue_id"]
 
         for ev in valid_events:
@@ -316,6 +627,7 @@ class Command(BaseCommand):
             existing_event = event_map.get(ev_id)
             if existing_event:
                 changed = False
+                previous_venue_id = existing_event.venue_id
                 for field in fields_to_check:
                     new_value = None
                     if field == "venue_id":
@@ -331,6 +643,8 @@ class Command(BaseCommand):
                         changed = True
                 if changed:
                     events_to_update.append(existing_event)
+                    affected_venue_ids.add(previous_venue_id)
+                    affected_venue_ids.add(existing_event.venue_id)
             else:
                 new_events.append(
                     Event(
@@ -341,23 +655,175 @@ class Command(BaseCommand):
                         venue=venue,
                     )
                 )
+                affected_venue_ids.add(venue.id if venue else None)
+
+        self.phase_times["diff"] += time.perf_counter() - phase_started
+
+        if not self.dry_run and (new_events or events_to_update):
+            from events.realtime import event_payload, publish_changes
+            from events.search import update_search_vectors
+
+            phase_started = time.perf_counter()
+            # Все строки пакета с одной отметкой updated_at фиксируются одной
+            # транзакцией: иначе лента изменений могла бы сдвинуть курсор за
+            # созданные события раньше, чем станут видны обновленные.
+            with transaction.atomic():
+                changed_at = timezone.now()
+                for event in new_events + events_to_update:
+                    event.updated_at = changed_at
+                if new_events:
+                    self.bulk_process(new_events, Event)
+                if events_to_update:
+                    self.bulk_process(
+                        events_to_update,
+                        Event,
+                        update_fields=[
+                            "name",
+                            "event_time",
+                            "status",
+                            "venue",
+                            "updated_at",
+                        ],
+                    )
+                update_search_vectors(
+                    [e.id for e in new_events + events_to_update],
+                    batch_size=self.batch_size,
+                )
+                publish_changes(
+                    created=[
+                        event_payload(e, venue_map.get(e.venue_id))
+                        for e in new_events
+                    ],
+                    updated=[
+                        event_payload(e, venue_map.get(e.venue_id))
+                        for e in events_to_update
+                    ],
+                )
+            self.phase_times["write"] += time.perf_counter() - phase_started
 
-        if not self.dry_run:
-            if new_events:
-                self.bulk_process(new_events, Event)
-            if events_to_update:
-                self.bulk_process(
-                    events_to_update,
-                    Event,
-                    update_fields=["name", "event_time", "status", "venue"],
+        return new_events, events_to_update, affected_venue_ids
+
+    def _sync_events(
+        self, events_data, event_days=None, period=(None, None), days=()
+    ):
+        """
+        Синхронизирует события и площадки на основе полученных данных.
+
+        События читаются из итератора по одному и записываются пакетами по
+        batch_size, поэтому потребление памяти не зависит от размера ответа.
+
+        param: Итерируемые данные событий (список или потоковый разбор ответа).
+        param: Словарь {id события: день его версии} для диапазона дней.
+        param: Пара (первый день, последний день) синхронизации.
+        param: Загруженные дни диапазона.
+        """
+        if not isinstance(events_data, Iterable) or isinstance(
+            events_data, (dict, str, bytes)
+        ):
+            self.stderr.write(
+                self.style.ERROR(
+                    "Invalid response format: expected a list of events"
                 )
+            )
+            return
+
+        if self.limit is not None:
+            events_data = islice(events_data, self.limit)
 
-            SyncResult.objects.create(
-                new_events_count=len(new_events),
-                updated_events_count=len(events_to_update),
+        self.phase_times = Counter()
+        received = 0
+        skipped_count = 0
+        failed = False
+        new_by_day = Counter()
+        updated_by_day = Counter()
+        affected_venue_ids = set()
+
+        def flush(chunk):
+            new_events, events_to_update, venues = self._sync_chunk(
+                list(chunk.values())
+            )
+            affected_venue_ids.update(venues)
+            days_of = event_days or {}
+            new_by_day.update(days_of.get(str(e.id)) for e in new_events)
+            updated_by_day.update(
+                days_of.get(str(e.id)) for e in events_to_update
             )
+            chunk.clear()
 
-        self.log_metrics(len(new_events), len(events_to_update))
+        # Повтор id внутри пакета схлопывается в последнюю версию.
+        chunk = {}
+        started = time.perf_counter()
+        try:
+            for ev in events_data:
+                received += 1
+                ev = self._validate_event(ev)
+                if ev is None:
+                    skipped_count += 1
+                    continue
+                chunk[ev["id"]] = ev
+                if len(chunk) >= self.batch_size:
+                    flush(chunk)
+        except (JSONError, UnexpectedFormat) as e:
+            self.stderr.write(
+                self.style.ERROR(f"Failed to parse JSON response: {e}")
+            )
+            failed = True
+        if chunk:
+            flush(chunk)
+        # Для потокового ответа сюда входит и чтение тела.
+        self.phase_times["validate"] = (
+            time.perf_counter()
+            - started
+            - self.phase_times["diff"]
+            - self.phase_times["write"]
+        )
+        if failed and not received:
+            if self.page_cache is not None:
+                self.page_cache.discard()
+            return
+
+        self.stdout.write(
+            self.style.NOTICE(f"Total events received: {received}")
+        )
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Events skipped due to validation: {skipped_count}"
+            )
+        )
+        SYNC_PHASE_DURATION.labels("validate").observe(
+            self.phase_times["validate"]
+        )
+        SYNC_PHASE_DURATION.labels("diff").observe(self.phase_times["diff"])
+
+        if not self.dry_run:
+            from events.realtime import bump_generation
+            from events.venue_stats import refresh_venue_stats
+
+            phase_started = time.perf_counter()
+            if new_by_day or updated_by_day:
+                refresh_venue_stats(
+                    affected_venue_ids, batch_size=self.batch_size
+                )
+                bump_generation()
+
+            self.save_results(
+                new_by_day, updated_by_day, event_days, period, days
+            )
+            SYNC_PHASE_DURATION.labels("write").observe(
+                self.phase_times["write"] + time.perf_counter() - phase_started
+            )
+            SYNC_EVENTS.labels("new").inc(new_by_day.total())
+            SYNC_EVENTS.labels("updated").inc(updated_by_day.total())
+            SYNC_EVENTS.labels("skipped").inc(skipped_count)
+
+        self.log_metrics(new_by_day.total(), updated_by_day.total())
+        if self.page_cache is not None:
+            # Частично обработанная страница не должна считаться примененной.
+            if failed or self.dry_run or self.limit is not None:
+                self.page_cache.discard()
+            else:
+                self.page_cache.commit()
+            self.stdout.write(self.style.NOTICE(self.page_cache.summary()))
 
     def handle(self, *args, **kwargs):
         """
@@ -369,72 +835,133 @@ class Command(BaseCommand):
         self.batch_size = kwargs.get("batch_size", DEFAULT_BATCH_SIZE)
         date_str = kwargs.get("date")
         all_flag = kwargs.get("all", False)
+        if kwargs.get("date_to") and not kwargs.get("date_from"):
+            raise CommandError("--to requires --from")
+        if sum(map(bool, (all_flag, date_str, kwargs.get("date_from")))) > 1:
+            raise CommandError(
+                "--all, --date and --from are mutually exclusive"
+            )
         self.dry_run = kwargs.get("dry_run", False)
         self.limit = kwargs.get("limit")
         self.timeout = kwargs.get("timeout", DEFAULT_TIMEOUT)
         self.max_retries = kwargs.get("max_retries", MAX_RETRIES)
+        self.page_cache = (
+            PageCache(
+                settings.EVENTS_FACE["PAGE_CACHE_DIR"],
+                settings.EVENTS_FACE["PAGE_CACHE_MAX_BYTES"],
+            )
+            if settings.EVENTS_FACE.get("PAGE_CACHE_ENABLED")
+            and not kwargs.get("no_cache")
+            else None
+        )
 
-        if all_flag:
-            all_events = []
-            url = BASE_URL
-            page_number = 1
-            while url:
-                response = self.fetch_with_retries(
-                    url, max_retries=self.max_retries, timeout=self.timeout
-                )
-                if response is None:
-                    break
+        # Проверки существования читают основную базу начиная с первого
+        # пакета: отстающая реплика не видит недавно записанных событий, и
+        # повторная вставка закончилась бы IntegrityError.
+        token = pin_to_primary()
+        try:
+            phase_started = time.perf_counter()
+            if all_flag:
+                self._sync_events(self.iter_all_pages())
+            elif kwargs.get("date_from"):
                 try:
-                    data = response.json()
-                except ValueError:
-                    self.stderr.write(
-                        self.style.ERROR("Failed to parse JSON response")
+                    date_from = datetime.strptime(
+                        kwargs["date_from"], "%Y-%m-%d"
+                    ).date()
+                    date_to = (
+                        datetime.strptime(kwargs["date_to"], "%Y-%m-%d").date()
+                        if kwargs.get("date_to")
+                        else datetime.now().date() - timedelta(days=1)
                     )
-                    break
-                events_page = (
-                    data.get("results") if isinstance(data, dict) else None
-                )
-                if events_page is None:
-                    if isinstance(data, list):
-                        events_page = data
-                        url = None
-                    else:
-                        self.stderr.write(
-                            self.style.ERROR("Unexpected JSON format")
-                        )
-                        break
-                all_events.extend(events_page)
-                logger.info(
-                    f"Fetched page {page_number} with {len(events_page)} events"
-                )
-                next_url = data.get("next") if isinstance(data, dict) else None
-                url = next_url
-                page_number += 1
-            self._sync_events(all_events)
-        else:
-            if date_str:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
                 except ValueError:
                     self.stderr.write(self.style.ERROR("Invalid date format"))
                     return
+                if date_from > date_to:
+                    self.stderr.write(
+                        self.style.ERROR("--from must not be later than --to")
+                    )
+                    return
+                self._backfill(date_from, date_to, kwargs.get("workers"))
             else:
-                date_obj = datetime.now().date() - timedelta(days=1)
+                if date_str:
+                    try:
+                        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+                    except ValueError:
+                        self.stderr.write(self.style.ERROR("Invalid date format"))
+                        return
+                else:
+                    date_obj = datetime.now().date() - timedelta(days=1)
 
-            url = f"{BASE_URL}?changed_at={date_obj}"
+                events_data = self.open_day(date_obj)
+                if events_data is None:
+                    return
+                SYNC_PHASE_DURATION.labels("fetch").observe(
+                    time.perf_counter() - phase_started
+                )
 
-            response = self.fetch_with_retries(
-                url, max_retries=self.max_retries, timeout=self.timeout
-            )
-            if response is None:
-                return
+                self._sync_events(events_data, period=(date_obj, date_obj))
+        finally:
+            reset_pinning(token)
 
-            try:
-                events_data = response.json()
-            except ValueError:
+    def _backfill(self, date_from: date, date_to: date, workers: int):
+        """
+        Загружает изменения за каждый день диапазона параллельно и
+        записывает их одним пакетным проходом.
+
+        :param date_from: Первый день диапазона.
+        :param date_to: Последний день диапазона (включительно).
+        :param workers: Количество параллельных загрузок.
+        :raises CommandError: Если часть дней не удалось загрузить.
+        """
+        # Дни диапазона сливаются по версии события, поэтому каждый день
+        # загружается целиком: пропущенный по кэшу день вернул бы пустой
+        # список, и устаревшая копия события из другого дня взяла бы верх.
+        self.page_cache = None
+        phase_started = time.perf_counter()
+        days = [
+            date_from + timedelta(days=offset)
+            for offset in range((date_to - date_from).days + 1)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, workers or 1)) as pool:
+            fetched = list(zip(days, pool.map(self.fetch_day, days)))
+
+        days_events = []
+        failed_days = []
+        for day, events_data in fetched:
+            if events_data is None:
                 self.stderr.write(
-                    self.style.ERROR("Failed to parse JSON response")
+                    self.style.ERROR(f"Skipping {day}: fetch failed")
                 )
-                return
+                failed_days.append(day)
+                continue
+            logger.info(f"Fetched {len(events_data)} events changed at {day}")
+            days_events.append((day, events_data))
+        SYNC_PHASE_DURATION.labels("fetch").observe(
+            time.perf_counter() - phase_started
+        )
 
-            self._sync_events(events_data)
+        events_data, event_days = merge_day_events(days_events)
+        received = sum(len(events) for _, events in days_events)
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Days fetched: {len(days_events)}/{len(days)}, "
+                f"duplicates merged: {received - len(events_data)}"
+            )
+        )
+        # Итог по диапазону записывается, только если загружены все дни;
+        # иначе остаются итоги загруженных дней, а команда завершается
+        # ошибкой со списком пропущенных.
+        if days_events:
+            self._sync_events(
+                events_data,
+                event_days=event_days,
+                period=(
+                    (date_from, date_to) if not failed_days else (None, None)
+                ),
+                days=[day for day, _ in days_events],
+            )
+        if failed_days:
+            raise CommandError(
+                "Failed to fetch days: "
+                + ", ".join(day.isoformat() for day in failed_days)
+            )
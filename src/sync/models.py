@@ -5,6 +5,15 @@ class SyncResult(models.Model):
     sync_date = models.DateField(auto_now_add=True)
     new_events_count = models.PositiveIntegerField(default=0)
     updated_events_count = models.PositiveIntegerField(default=0)
+    period_start = models.DateField(null=True, blank=True)
+    period_end = models.DateField(null=True, blank=True)
+    parent = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="days",
+    )
 
     def __str__(self):
         return f"Sync {self.sync_date} - New: {self.new_events_count}, Updated: {self.updated_events_count}"
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+from common.logger import get_logger
+from common.metrics import SYNC_PAGE_CACHE
+
+logger = get_logger(__name__)
+
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+FETCHED = "fetched"
+
+
+class PageCache:
+    """
+    Дисковый кэш страниц поставщика по URL. Хранит не тело, а валидаторы
+    (ETag, Last-Modified), хэш содержимого и ссылку на следующую страницу:
+    совпадение означает, что страница уже применена к базе и ее можно
+    пропустить целиком.
+
+    Новые записи копятся в памяти и сохраняются commit() только после
+    успешной синхронизации, чтобы сбой не пометил страницу примененной.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> dict | None:
+        """
+        Возвращает запись для URL или None.
+        """
+        path = self._path(url)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        try:
+            # Время доступа для вытеснения давно не используемых записей.
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: dict | None) -> dict:
+        """
+        Заголовки условного запроса для записи кэша.
+        """
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def stage(self, url: str, entry: dict, result: str):
+        """
+        Учитывает исход запроса страницы и готовит запись к сохранению.
+
+        :param url: URL страницы.
+        :param entry: Валидаторы, хэш, формат и ссылка на следующую страницу.
+        :param result: NOT_MODIFIED, UNCHANGED или FETCHED.
+        """
+        with self._lock:
+            self.stats[result] += 1
+            self._pending[url] = {"url": url, **entry}
+        SYNC_PAGE_CACHE.labels(result).inc()
+
+    def commit(self):
+        """
+        Сохраняет подготовленные записи и вытесняет старые сверх max_bytes.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for url, entry in pending.items():
+                path = self._path(url)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(entry))
+                os.replace(tmp, path)
+            self.evict()
+        except OSError as e:
+            logger.warning(f"Failed to save provider page cache: {e}")
+
+    def discard(self):
+        """
+        Отбрасывает подготовленные записи (сбой, --dry-run или --limit).
+        """
+        with self._lock:
+            self._pending = {}
+
+    def evict(self):
+        """
+        Удаляет записи, к которым дольше всего не обращались, пока общий
+        размер кэша превышает max_bytes.
+        """
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def summary(self) -> str:
+        hits = self.stats[NOT_MODIFIED] + self.stats[UNCHANGED]
+        return (
+            f"Page cache: {hits} hits ({self.stats[NOT_MODIFIED]} not modified, "
+            f"{self.stats[UNCHANGED]} unchanged), {self.stats[FETCHED]} misses"
+        )
@@ -0,0 +1,96 @@
+import ijson
+
+JSONError = ijson.JSONError
+
+BUFFER_SIZE = 64 * 1024
+
+
+class UnexpectedFormat(ValueError):
+    """
+    Ответ является корректным JSON, но не содержит списка событий.
+    """
+
+
+class PageInfo:
+    """
+    Сведения о странице ответа поставщика, собранные при потоковом разборе.
+    """
+
+    __slots__ = ("shape", "next_url", "count")
+
+    def __init__(self):
+        self.shape = None
+        self.next_url = None
+        self.count = 0
+
+
+class _PrefixedStream:
+    """
+    Файлоподобный объект, возвращающий сначала уже прочитанное начало потока.
+    """
+
+    def __init__(self, head: bytes, stream):
+        self.head = head
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson вызывает read(0), чтобы определить тип потока.
+        if self.head and size != 0:
+            data, self.head = self.head, b""
+            return data
+        return self.stream.read(size)
+
+
+def iter_events(stream, page_info: PageInfo):
+    """
+    Потоково разбирает ответ поставщика и по одному отдает события, не строя
+    в памяти весь документ. Поддерживает оба формата: список событий и
+    страницу вида {"next": ..., "results": [...]}.
+
+    :param stream: Файлоподобный объект с телом ответа (bytes).
+    :param page_info: Заполняется форматом ответа и ссылкой на следующую страницу.
+    :raises JSONError: Если тело ответа не является корректным JSON.
+    :raises UnexpectedFormat: Если в ответе нет списка событий.
+    """
+    head = stream.read(BUFFER_SIZE)
+    while head.isspace():
+        chunk = stream.read(BUFFER_SIZE)
+        if not chunk:
+            break
+        head += chunk
+    stream = _PrefixedStream(head, stream)
+
+    if head.lstrip()[:1] == b"[":
+        # Список целиком собирается C-бэкендом ijson: это основной и
+        # самый объемный формат (выгрузка за день).
+        page_info.shape = "list"
+        for item in ijson.items(stream, "item", use_float=True):
+            page_info.count += 1
+            yield item
+        return
+
+    item_prefix = None
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == item_prefix and event in ("end_map", "end_array"):
+                page_info.count += 1
+                yield builder.value
+                builder = None
+            continue
+
+        if prefix == "next" and event in ("string", "null"):
+            page_info.next_url = value
+        elif prefix == "results" and event == "start_array":
+            page_info.shape = "page"
+            item_prefix = "results.item"
+        elif prefix == item_prefix and event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == item_prefix:
+            page_info.count += 1
+            yield value
+
+    if page_info.shape is None:
+        raise UnexpectedFormat("Unexpected JSON format")
@@ -1,10 +1,24 @@
 from django.contrib import admin
 from django.urls import include, path
 
-from events.views import EventListView
+from core.views import metrics_view
+from events.views import (
+    EventChangesView,
+    EventListView,
+    VenueListView,
+    event_stream_view,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("authapp.urls")),
     path("api/events/", EventListView.as_view(), name="event-list"),
+    path(
+        "api/events/changes/",
+        EventChangesView.as_view(),
+        name="event-changes",
+    ),
+    path("api/events/stream/", event_stream_view, name="event-stream"),
+    path("api/venues/", VenueListView.as_view(), name="venue-list"),
+    path("metrics", metrics_view, name="metrics"),
 ]